@@ -3,6 +3,8 @@ import sys
 from modules.news_processor import NewsProcessor
 from modules.forks_processor import ForksProcessor
 from modules.config_manager import ConfigManager
+from modules.url_utils import extract_repo_info
+from modules.state_manager import StateManager
 
 
 def is_github_url(arg):
@@ -10,12 +12,6 @@ def is_github_url(arg):
     return arg.startswith(('https://github.com/', 'http://github.com/', 'github.com/'))
 
 
-def extract_repo_info(url, fetcher=None, include_repo_key=False):
-    """Extract owner and repo name from GitHub URL - consolidated utility function"""
-    from modules.url_utils import extract_repo_info as _extract_repo_info
-    return _extract_repo_info(url, fetcher, include_repo_key)
-
-
 def create_temp_repository(url):
     """Create temporary repository structure from URL"""
     owner, repo_name = extract_repo_info(url)
@@ -90,8 +86,8 @@ def list_command():
         for repo in repos:
             try:
                 # Extract owner/repo for state key
-                owner, repo_name = extract_repo_info(repo['url'])
-                repo_key = f"{owner}/{repo_name}" if owner else repo_name
+                # Same lowercased key the processors save state under
+                owner, repo_name, repo_key = extract_repo_info(repo['url'], include_repo_key=True)
                 
                 # Get last commit info
                 last_commit = state.get(repo_key, {}).get('last_commit', 'Not tracked')
@@ -101,7 +97,7 @@ def list_command():
                     # Format the datetime nicely
                     try:
                         from datetime import datetime
-                        check_time = datetime.fromisoformat(last_check)
+                        check_time = datetime.fromtimestamp(StateManager.check_timestamp(last_check))
                         last_check = check_time.strftime('%Y-%m-%d %H:%M')
                     except:
                         pass
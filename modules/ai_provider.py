@@ -1,8 +1,11 @@
 import subprocess
 import json
 import re
+import threading
 from .debug_logger import DebugLogger
 
+_WHITESPACE_RE = re.compile(r'\s*')
+
 
 def check_test_mode(prompt, verbose=False):
     """Check if we're in test mode and return mock response if available"""
@@ -52,9 +55,10 @@ class ClaudeCLIProvider:
         claude_path = config_manager.get_claude_cli_path()
         self.claude_cmd = [claude_path, "--print", "--output-format", "stream-json", "--verbose"]
         
-        # Integrated cost tracking
+        # Integrated cost tracking (summaries run concurrently - the counters are updated under a lock)
         self.total_cost = 0.0
         self.total_tokens = {'input': 0, 'output': 0}
+        self._usage_lock = threading.Lock()
     
     def generate_summary(self, prompt: str) -> dict:
         """Generate summary using Claude CLI"""
@@ -92,12 +96,13 @@ class ClaudeCLIProvider:
     
     def track_usage(self, input_tokens, output_tokens):
         """Integrated cost tracking"""
-        self.total_tokens['input'] += input_tokens
-        self.total_tokens['output'] += output_tokens
         # Claude Sonnet 4 pricing: $3/$15 per MTok
         input_cost = input_tokens * 3 / 1_000_000
         output_cost = output_tokens * 15 / 1_000_000
-        self.total_cost += input_cost + output_cost
+        with self._usage_lock:
+            self.total_tokens['input'] += input_tokens
+            self.total_tokens['output'] += output_tokens
+            self.total_cost += input_cost + output_cost
     
     def format_cost_info(self, cost_info):
         """Format cost information for display"""
@@ -114,15 +119,17 @@ class ClaudeCLIProvider:
     
     def get_total_cost_info(self):
         """Get total cost information as dict"""
-        return {
-            'estimated_cost': self.total_cost,
-            'total_tokens': self.total_tokens['input'] + self.total_tokens['output']
-        }
+        with self._usage_lock:
+            return {
+                'estimated_cost': self.total_cost,
+                'total_tokens': self.total_tokens['input'] + self.total_tokens['output']
+            }
     
     def reset(self):
         """Reset cost tracking"""
-        self.total_cost = 0.0
-        self.total_tokens = {'input': 0, 'output': 0}
+        with self._usage_lock:
+            self.total_cost = 0.0
+            self.total_tokens = {'input': 0, 'output': 0}
     
     def _call_claude(self, prompt):
         """Execute Claude CLI with subprocess using piped input"""
@@ -161,17 +168,30 @@ class ClaudeCLIProvider:
         """Parse stream-json output from Claude CLI"""
         try:
             content_parts = []
-            lines = raw_output.strip().split('\n')
             
-            self.debug_logger.debug(f"Parsing {len(lines)} JSON lines from stream output")
+            self.debug_logger.debug(f"Parsing {len(raw_output)} characters of stream output")
             self.debug_logger.debug(f"Raw output preview: {raw_output[:500]}...")
             
-            for line in lines:
-                if not line.strip():
-                    continue
+            # Walk the NDJSON buffer with raw_decode instead of splitting it into a list of lines
+            decoder = json.JSONDecoder()
+            idx = 0
+            buf_len = len(raw_output)
+            while True:
+                idx = _WHITESPACE_RE.match(raw_output, idx).end()
+                if idx >= buf_len:
+                    break
+                line_end = raw_output.find('\n', idx)
+                if line_end == -1:
+                    line_end = buf_len
                     
                 try:
-                    json_obj = json.loads(line)
+                    json_obj, obj_end = decoder.raw_decode(raw_output, idx)
+                    # Only a whole line holding one JSON object counts - a line that merely starts with JSON
+                    # ('2024 warning', '"note" from cli', an object spanning lines) is plain text, as with
+                    # the per-line json.loads this replaced
+                    if not isinstance(json_obj, dict) or obj_end > line_end or raw_output[obj_end:line_end].strip():
+                        raise json.JSONDecodeError("Not a single JSON object line", raw_output, obj_end)
+                    idx = obj_end
                     
                     self.debug_logger.debug(f"JSON object keys: {list(json_obj.keys())}")
                     self.debug_logger.debug(f"JSON object: {json_obj}")
@@ -202,8 +222,11 @@ class ClaudeCLIProvider:
                         content_parts.append(json_obj['message'])
                         
                 except json.JSONDecodeError as e:
+                    # Keep non-JSON lines as plain text, then resume at the next line
+                    line = raw_output[idx:line_end].strip()
                     self.debug_logger.debug(f"Failed to parse JSON line: {line[:100]}... Error: {e}")
                     content_parts.append(line)
+                    idx = line_end
             
             result = ''.join(content_parts).strip()
             result = self._strip_markdown(result)
@@ -237,9 +260,10 @@ class OpenAIProvider:
         self.model = config_manager.get_ai_model() or 'gpt-4o'
         self.timeout = config_manager.get_ai_timeout()
         
-        # Integrated cost tracking
+        # Integrated cost tracking (summaries run concurrently - the counters are updated under a lock)
         self.total_cost = 0.0
         self.total_tokens = {'input': 0, 'output': 0}
+        self._usage_lock = threading.Lock()
         
         if not self.api_key:
             raise ValueError(
@@ -304,9 +328,6 @@ class OpenAIProvider:
     
     def track_usage(self, input_tokens, output_tokens):
         """Integrated cost tracking"""
-        self.total_tokens['input'] += input_tokens
-        self.total_tokens['output'] += output_tokens
-        
         # Calculate cost based on model
         pricing = {
             'gpt-4o': {'input': 3.00, 'output': 10.00},
@@ -317,7 +338,10 @@ class OpenAIProvider:
         model_pricing = pricing.get(self.model, pricing['gpt-4o-mini'])
         input_cost = input_tokens * model_pricing['input'] / 1_000_000
         output_cost = output_tokens * model_pricing['output'] / 1_000_000
-        self.total_cost += input_cost + output_cost
+        with self._usage_lock:
+            self.total_tokens['input'] += input_tokens
+            self.total_tokens['output'] += output_tokens
+            self.total_cost += input_cost + output_cost
     
     def format_cost_info(self, cost_info):
         """Format cost information for display"""
@@ -334,15 +358,17 @@ class OpenAIProvider:
     
     def get_total_cost_info(self):
         """Get total cost information as dict"""
-        return {
-            'estimated_cost': self.total_cost,
-            'total_tokens': self.total_tokens['input'] + self.total_tokens['output']
-        }
+        with self._usage_lock:
+            return {
+                'estimated_cost': self.total_cost,
+                'total_tokens': self.total_tokens['input'] + self.total_tokens['output']
+            }
     
     def reset(self):
         """Reset cost tracking"""
-        self.total_cost = 0.0
-        self.total_tokens = {'input': 0, 'output': 0}
+        with self._usage_lock:
+            self.total_cost = 0.0
+            self.total_tokens = {'input': 0, 'output': 0}
     
     def _calculate_openai_cost(self, response, model):
         """Calculate cost based on OpenAI pricing"""
@@ -1,29 +1,73 @@
 """Shared utilities for commit processing and filtering"""
 
-def filter_commits_since_last_processed(commits, last_processed_commit):
+def filter_commits_since_last_processed(commits, last_processed_commit, order='oldest_first'):
     """
     Filter commits to only include those newer than last processed commit.
     
     Args:
         commits: List of commit objects with 'sha' field
         last_processed_commit: SHA of last processed commit
+        order: 'oldest_first' (compare API) or 'newest_first' (commits API) input order
         
     Returns:
-        List of commits newer than last_processed_commit
+        List of commits newer than last_processed_commit, oldest first
     """
-    if not last_processed_commit or not commits:
-        return commits
-    
-    # Find index of last processed commit
+    if not commits:
+        return []
+    # Saved SHAs may be abbreviated, so this is a prefix match - no exact-key dict lookup possible
     last_commit_index = None
-    for i, commit in enumerate(commits):
-        if commit['sha'].startswith(last_processed_commit):
-            last_commit_index = i
-            break
+    if last_processed_commit:
+        last_commit_index = next(
+            (i for i, commit in enumerate(commits) if commit['sha'].startswith(last_processed_commit)), None
+        )
+    
+    if order == 'newest_first':
+        # Newer commits sit in front of the last processed one - slice them off reversed
+        # instead of reversing the whole list first
+        if last_commit_index is None:
+            return commits[::-1]
+        return commits[last_commit_index - 1::-1] if last_commit_index else []
     
-    # If last commit found, take commits after it (newer commits)
-    if last_commit_index is not None:
-        return commits[last_commit_index + 1:]
+    # If last commit found, take commits after it (newer commits); otherwise all commits are new
+    if last_commit_index is None:
+        return commits
+    return commits[last_commit_index + 1:]
+
+
+def latest_commit_timestamp(commits):
+    """
+    Author date of the newest commit in an oldest-first commit list.
     
-    # If last commit not found, all commits are new
-    return commits
\ No newline at end of file
+    Args:
+        commits: List of commit objects with a nested 'commit' field (compare API order)
+        
+    Returns:
+        ISO 8601 timestamp, or None if there are no commits
+    """
+    if not commits:
+        return None
+    return commits[-1].get('commit', {}).get('author', {}).get('date')
+
+
+def reaches_commit(commits, head_sha, target_sha):
+    """
+    Check that a commit list links head_sha to target_sha along first parents.
+    
+    Args:
+        commits: List of commit objects with 'sha' and 'parents' fields (commits API)
+        head_sha: SHA the walk starts from (None = the first listed commit)
+        target_sha: SHA to reach (may be abbreviated)
+        
+    Returns:
+        True if every commit on the first-parent path from head_sha down to target_sha is in the list
+    """
+    by_sha = {commit['sha']: commit for commit in commits}
+    sha = head_sha or (commits[0]['sha'] if commits else None)
+    while sha:
+        if sha.startswith(target_sha):
+            return True
+        commit = by_sha.pop(sha, None)  # pop: a malformed parent loop can't spin forever
+        if commit is None or not commit.get('parents'):
+            return False
+        sha = commit['parents'][0]['sha']
+    return False
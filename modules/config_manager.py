@@ -5,6 +5,48 @@ import shutil
 import sys
 from .comment_preserving_parser import CommentPreservingINIParser
 
+try:
+    import orjson  # Optional: C serializer, several times faster on large state files
+except ImportError:
+    orjson = None
+
+_SHA_KEYS = ('last_commit', 'last_ahead_commit')
+
+
+def _intern_shas(obj):
+    """json object_hook: intern saved commit SHAs (one shared string per SHA, identity-fast compares)"""
+    for key in _SHA_KEYS:
+        value = obj.get(key)
+        if type(value) is str:
+            obj[key] = sys.intern(value)
+    return obj
+
+
+def _intern_state_tree(obj):
+    """Apply _intern_shas to every dict of an already-parsed state (orjson has no object_hook)"""
+    if isinstance(obj, dict):
+        for value in obj.values():
+            _intern_state_tree(value)
+        _intern_shas(obj)
+    elif isinstance(obj, list):
+        for value in obj:
+            _intern_state_tree(value)
+    return obj
+
+
+def _state_loads(data):
+    """Parse state JSON (bytes or str) with saved SHAs interned"""
+    if orjson is not None:
+        return _intern_state_tree(orjson.loads(data))
+    return json.loads(data, object_hook=_intern_shas)
+
+
+def _state_dumps(obj, indent=False):
+    """Serialize state to UTF-8 JSON bytes (2-space indent for the state files, compact for journal lines)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
 
 class ConfigManager:
     def __init__(self, config_path='config.txt', state_path='state.json', debug_override=None):
@@ -163,15 +205,52 @@ class ConfigManager:
         else:
             raise ValueError(f"Unknown state_type: {state_type}")
 
+    def get_response_cache_filename(self):
+        """Get the HTTP response cache path (kept alongside the state files)"""
+        return os.path.join(os.path.dirname(self.state_path), 'response_cache.db')
+
+    def get_state_journal_filename(self, state_type='news'):
+        """Get the append-only journal path for a state file (news_state.json -> news_state.journal)"""
+        return os.path.splitext(self.get_state_filename(state_type))[0] + '.journal'
+
     def load_state(self, state_type='news'):
+        """Load state, replaying any journal entries a run appended after the last full save"""
+        state = self._load_state_file(state_type)
+        journal_file = self.get_state_journal_filename(state_type)
+        try:
+            with open(journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _state_loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn final line from an interrupted write - everything before it is intact
+                    state[entry['repo_key']] = entry['state']
+        except FileNotFoundError:
+            pass
+        return state
+
+    def has_state_journal(self, state_type='news'):
+        """True if journal entries are waiting to be folded into the state file"""
+        return os.path.exists(self.get_state_journal_filename(state_type))
+
+    def append_state_journal(self, repo_states, state_type='news'):
+        """Append {repo_key: repo_state} entries to the journal, one JSON line each (O(changes), not O(state))"""
+        lines = b''.join(
+            _state_dumps({'repo_key': repo_key, 'state': repo_state}) + b'\n'
+            for repo_key, repo_state in repo_states.items()
+        )
+        with open(self.get_state_journal_filename(state_type), 'ab') as f:
+            f.write(lines)
+
+    def _load_state_file(self, state_type='news'):
         """Load state from appropriate file"""
         state_file = self.get_state_filename(state_type)
         
         # Check if state file already exists
         if os.path.exists(state_file):
             try:
-                with open(state_file, 'r') as f:
-                    return json.load(f)
+                with open(state_file, 'rb') as f:
+                    return _state_loads(f.read())
             except json.JSONDecodeError:
                 raise ValueError(f"Invalid JSON in {state_file}")
         
@@ -180,18 +259,25 @@ class ConfigManager:
         
         # Try loading again after potential migration
         try:
-            with open(state_file, 'r') as f:
-                return json.load(f)
+            with open(state_file, 'rb') as f:
+                return _state_loads(f.read())
         except FileNotFoundError:
             return {}
         except json.JSONDecodeError:
             raise ValueError(f"Invalid JSON in {state_file}")
     
     def save_state(self, state_data, state_type='news'):
-        """Save updated state to appropriate file"""
+        """Save updated state to appropriate file (temp file + atomic replace, never a torn file)"""
         state_file = self.get_state_filename(state_type)
-        with open(state_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
+        temp_file = f"{state_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(_state_dumps(state_data, indent=True))
+        os.replace(temp_file, state_file)
+        # The full file now covers everything the journal recorded
+        try:
+            os.remove(self.get_state_journal_filename(state_type))
+        except FileNotFoundError:
+            pass
     
     def migrate_legacy_state(self):
         """Safely migrate old state.json to separate news_state.json and forks_state.json"""
@@ -112,9 +112,7 @@ class TerminalDisplay:
     def _print_summary_section(self, title, summary):
         """Print formatted summary section with separators"""
         width = self._get_separator_width()
-        print(title)
-        print(f"{'-'*width}")
-        print(summary)
+        print(f"{title}\n{'-'*width}\n{summary}")
     
     def display_loading(self, message):
         """Show loading message"""
@@ -137,14 +135,13 @@ class TerminalDisplay:
         """Display repository header for fork analysis"""
         header = self._build_base_title(repo_name, repo_url, "FORK ANALYSIS |", "")
         width = self._get_separator_width()
-        print('=' * width)
-        print(header)
-        print()
+        print(f"{'=' * width}\n{header}\n")
 
     def display_fork_summary(self, repo_name, fork_name, fork_url, commits_ahead, summary, branches=None, last_commit_timestamp=None):
         """Display individual fork analysis results with optional multi-branch information"""
         width = self._get_separator_width()
-        print('-' * width)
+        # Lines are collected and written with a single print() so the block hits stdout at once
+        lines = ['-' * width]
         
         # Show basic fork info with total commits ahead
         fork_title = f"🍴 {self._create_hyperlink(fork_name, fork_url)} (+{commits_ahead})"
@@ -155,12 +152,12 @@ class TerminalDisplay:
             if time_ago:
                 fork_title += f" ({time_ago})"
         
-        print(fork_title)
-        print('-' * width)
+        lines.append(fork_title)
+        lines.append('-' * width)
         
         # Show branch breakdown if available
         if branches:
-            print("Branches:")
+            lines.append("Branches:")
             for branch in branches:
                 branch_name = branch['branch_name']
                 branch_commits = branch['commits_ahead']
@@ -175,11 +172,12 @@ class TerminalDisplay:
                     if time_ago:
                         time_str = f" ({time_ago})"
                 
-                print(f"  ├─ {branch_name}:{default_marker} (+{branch_commits}){time_str}")
-            print()
+                lines.append(f"  ├─ {branch_name}:{default_marker} (+{branch_commits}){time_str}")
+            lines.append("")
         
-        print(summary)
-        print()
+        lines.append(summary)
+        lines.append("")
+        print('\n'.join(lines))
 
     def display_no_active_forks(self, repo_name):
         """Display when no active forks found"""
@@ -192,9 +190,7 @@ class TerminalDisplay:
         title = self._add_cost_to_title(title, total_cost_info, show_costs)
         
         width = self._get_separator_width()
-        print(f"{'='*width}")
-        print(title)
-        print()
+        print(f"{'='*width}\n{title}\n")
 
     def display_news_summary(self, repo_name, summary, cost_info=None, show_costs=False, repo_url=None, version=None, branch_analysis=None, last_commit_timestamp=None, commits_count=None):
         """Enhanced news summary display with branch information"""
@@ -215,12 +211,12 @@ class TerminalDisplay:
         
         # Print title with separators
         width = self._get_separator_width()
-        print()  # Add spacing before repository headline
-        print(title)
+        # Lines are collected and written with a single print() so the block hits stdout at once
+        lines = ["", title]  # Leading blank line adds spacing before repository headline
         
         # Display branch breakdown (matches fork display pattern)
         if branch_analysis and branch_analysis.get('has_updates'):
-            print(f"Branches:")
+            lines.append("Branches:")
             
             for i, branch in enumerate(branch_analysis['branches']):
                 branch_name = branch['branch_name']
@@ -231,14 +227,15 @@ class TerminalDisplay:
                 default_marker = " ⭐" if is_default else ""
                 prefix = "├─" if i < len(branch_analysis['branches']) - 1 else "└─"
                 
-                print(f"  {prefix} {branch_name}: +{commits_ahead} commits{default_marker}")
-            print()
+                lines.append(f"  {prefix} {branch_name}: +{commits_ahead} commits{default_marker}")
+            lines.append("")
         
-        print(f"{'-'*width}")
-        print(summary)
+        lines.append('-' * width)
+        lines.append(summary)
         # Only add spacing if summary has content
         if summary and summary.strip():
-            print()
+            lines.append("")
+        print('\n'.join(lines))
 
     def display_branch_summary(self, branch_name, commits_ahead, summary, cost_info=None, show_costs=False, is_default=False, last_commit_timestamp=None):
         """Display individual branch summary with separate section"""
@@ -254,8 +251,7 @@ class TerminalDisplay:
             title = self._add_timestamp_to_title(title, last_commit_timestamp)
             
         title = self._add_cost_to_title(title, cost_info, show_costs)
-        self._print_summary_section(title, summary)
-        print()  # Add spacing after branch summary
+        self._print_summary_section(title, summary + "\n")  # Trailing newline adds spacing after branch summary
 
     def display_no_changes(self, repo_name):
         """Display when repository has no changes (early exit)"""
@@ -1,15 +1,22 @@
 from .parallel_base_processor import ParallelBaseProcessor
 from .debug_logger import DebugLogger
-from .commit_utils import filter_commits_since_last_processed
+from .commit_utils import filter_commits_since_last_processed, latest_commit_timestamp
 from .state_manager import StateManager
 from datetime import datetime
 
 class ForksProcessor(ParallelBaseProcessor):
     """Processor for fork analysis (forks ahead of parent)"""
     
+    __slots__ = ()
+    
     def __init__(self, repositories=None, debug_override=None):
         super().__init__(template_name='fork_summary', repositories=repositories, debug_override=debug_override)
         self.debug_logger = DebugLogger(self.config_manager)
+        # Fork-specific limits join the shared settings namespace (resolved once, read per repository)
+        self._cfg.max_forks = self.config_manager.get_int_setting('max_forks', 20)
+        self._cfg.min_commits_ahead = self.config_manager.get_int_setting('min_commits_ahead', 1)
+        self._cfg.max_branches_per_fork = self.config_manager.get_int_setting('max_branches_per_fork', 5)
+        self._cfg.analyze_default_branch_always = self.config_manager.get_boolean_setting('analyze_default_branch_always', True)
     
     @property
     def state_type(self):
@@ -20,42 +27,34 @@ class ForksProcessor(ParallelBaseProcessor):
         # Reset cost tracking at start of each repository
         self.generator.ai_provider.reset()
         
-        from .url_utils import extract_repo_info
-        owner, repo_name, repo_key = extract_repo_info(repo['url'], self.fetcher, include_repo_key=True)
+        owner, repo_name, repo_key = repo['_owner'], repo['_repo_name'], repo['_repo_key']
         
         # Get configuration limits
-        max_forks = self.config_manager.get_int_setting('max_forks', 20)
-        min_commits_ahead = self.config_manager.get_int_setting('min_commits_ahead', 1)
-        max_branches_per_fork = self.config_manager.get_int_setting('max_branches_per_fork', 5)
-        max_commits = self.config_manager.get_int_setting('max_commits', 10)
-        analyze_default_branch_always = self.config_manager.get_boolean_setting('analyze_default_branch_always', True)
+        max_forks = self._cfg.max_forks
+        min_commits_ahead = self._cfg.min_commits_ahead
+        max_branches_per_fork = self._cfg.max_branches_per_fork
+        max_commits = self._cfg.max_commits
+        analyze_default_branch_always = self._cfg.analyze_default_branch_always
         
         try:
-            # Get parent default branch
-            parent_default_branch = self.fetcher.get_default_branch(owner, repo_name)
-            
-            # Get latest commit timestamp for headline
-            try:
-                last_commit_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name)
-            except Exception:
-                last_commit_timestamp = None
-            
-            # Get parent repository README once at start
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('display_loading',f"Fetching parent README for {repo['name']}...")
-            parent_readme = self.fetcher.get_readme(owner, repo_name)
+            # Parent default branch and README are independent of the fork list - fetch them
+            # on the shared I/O pool while this worker lists the forks
+            default_branch_future = self._io_pool.submit(self.fetcher.get_default_branch, owner, repo_name)
+            if self._cfg.debug:
+                self._safe_display_loading(f"Fetching parent README for {repo['name']}...")
+            parent_readme_future = self._io_pool.submit(self.fetcher.get_readme, owner, repo_name)
             
             # Get forks for this repository
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('display_loading',f"Checking forks for {repo['name']}...")
-            forks = self.fetcher.get_forks(owner, repo_name, limit=max_forks)
+            if self._cfg.debug:
+                self._safe_display_loading(f"Checking forks for {repo['name']}...")
+            forks = self.fetcher.get_forks_bulk(owner, repo_name, limit=max_forks)
             
             # Debug output
             self.debug_logger.debug(f"Checking up to {max_forks} forks for {repo['name']}")
             self.debug_logger.debug(f"Found {len(forks)} total forks")
             
             if not forks:
-                if self.config_manager.get_boolean_setting('debug'):
+                if self._cfg.debug:
                     self._safe_display('display_no_active_forks',repo['name'])
                 # Display summary even when no forks found
                 self._safe_display('display_forks_summary',
@@ -63,19 +62,19 @@ class ForksProcessor(ParallelBaseProcessor):
                     0,  # active_count
                     0,  # total_count
                     self.generator.ai_provider.get_total_cost_info(),
-                    self.config_manager.get_show_costs_setting(),
+                    self._cfg.show_costs,
                     repo.get('url')
                 )
                 return
             
             # Track found ahead forks
             ahead_forks = []
-            show_costs = self.config_manager.get_show_costs_setting()
+            show_costs = self._cfg.show_costs
             header_displayed = False
             
             # OPTIMIZATION: Smart fork filtering with early exit
-            # Stage 1: Get lightweight fork list (just names and default branch info)
-            current_forks = self.fetcher.get_fork_last_commits(owner, repo_name, max_forks)
+            # Stage 1: Lightweight fork list (names and default branch info) - already fetched above
+            current_forks = forks
             
             # Stage 2: Filter by state before expensive operations
             forks_to_process = []
@@ -85,23 +84,25 @@ class ForksProcessor(ParallelBaseProcessor):
                     forks_to_process.append(fork)
             
             if not forks_to_process:
-                if self.config_manager.get_boolean_setting('debug'):
+                if self._cfg.debug:
                     self._safe_display('display_no_fork_changes',repo['name'])
                 # Display summary even when no forks need processing
                 self._safe_display('display_forks_summary',
                     repo['name'], 0, len(current_forks), 
                     self.generator.ai_provider.get_total_cost_info(),
-                    self.config_manager.get_show_costs_setting(),
+                    self._cfg.show_costs,
                     repo.get('url')
                 )
                 return
             
             # Stage 3: Full processing only for changed forks
+            parent_default_branch = default_branch_future.result()
+            parent_readme = parent_readme_future.result()
             ahead_forks = self._process_fork_subset(forks_to_process, repo, owner, repo_name, parent_default_branch, max_branches_per_fork, min_commits_ahead, analyze_default_branch_always, max_commits, parent_readme, repo_key)
             
             # Show message if no forks found after processing all
             if not ahead_forks:
-                if self.config_manager.get_boolean_setting('debug'):
+                if self._cfg.debug:
                     self._safe_display('display_no_active_forks',repo['name'])
             
             # Display repository-level fork summary
@@ -116,13 +117,13 @@ class ForksProcessor(ParallelBaseProcessor):
                 
         except Exception as e:
             if "404" in str(e):
-                self._safe_display('error',f"Repository {repo['name']} not found or not accessible")
+                self._safe_display_error(f"Repository {repo['name']} not found or not accessible")
             else:
                 raise
     
     def _should_process_fork(self, repo_key, fork_name, fork_commits):
         """Check if fork needs processing based on saved state"""
-        save_state_enabled = self.config_manager.get_boolean_setting('save_state', 'true')
+        save_state_enabled = self._cfg.save_state
         if not save_state_enabled:
             return True
             
@@ -141,7 +142,7 @@ class ForksProcessor(ParallelBaseProcessor):
 
     def _update_fork_state(self, repo_key, fork_info):
         """Update state tracking for processed forks with multi-branch support"""
-        StateManager.update_fork_state(self.state, repo_key, fork_info)
+        self._update_state(repo_key, StateManager.update_fork_state, fork_info)
     
     def _transform_comparison_commits(self, comparison_commits):
         """Transform comparison API commits to match expected structure for summary generator"""
@@ -160,18 +161,19 @@ class ForksProcessor(ParallelBaseProcessor):
 
     def _process_fork_branches(self, parent_owner, parent_repo, parent_default_branch, fork_owner, fork_name, 
                               fork_default_branch, max_branches_per_fork, min_commits_ahead,
-                              analyze_default_branch_always, max_commits, parent_readme, repo_key):
+                              analyze_default_branch_always, max_commits, parent_readme, repo_key, fork_branches=None):
         """Process all branches of a single fork and return consolidated analysis"""
         
-        # Get all branches for this fork
-        if self.config_manager.get_boolean_setting('debug'):
-            self._safe_display('display_loading',f"Analyzing branches for {fork_owner}/{fork_name}...")
-            
-        fork_branches = self.fetcher.get_fork_branches(fork_owner, fork_name)
+        # Get all branches for this fork (unless the bulk fork listing already returned them)
+        if self._cfg.debug:
+            self._safe_display_loading(f"Analyzing branches for {fork_owner}/{fork_name}...")
+        
+        if fork_branches is None:
+            fork_branches = self.fetcher.get_fork_branches(fork_owner, fork_name)
         
         if not fork_branches:
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('display_loading',f"No branches found for {fork_owner}/{fork_name}")
+            if self._cfg.debug:
+                self._safe_display_loading(f"No branches found for {fork_owner}/{fork_name}")
             return None
         
         # Debug output
@@ -250,30 +252,34 @@ class ForksProcessor(ParallelBaseProcessor):
                 else:
                     self.debug_logger.debug(f"No filtering for {branch_name} - saved: {last_processed_commit}, commits: {len(branch_commits) if branch_commits else 0}")
                 
-                # Get latest commit timestamp for this specific branch
-                try:
-                    if self.config_manager.get_boolean_setting('debug'):
-                        self._safe_display('display_loading',f"Fetching timestamp for {fork_owner}/{fork_name}:{branch_name}")
-                    branch_timestamp = self.fetcher.get_latest_commit_timestamp(fork_owner, fork_name, branch_name)
-                    if self.config_manager.get_boolean_setting('debug'):
-                        self._safe_display('display_loading',f"Got timestamp: {branch_timestamp}")
-                except Exception as e:
-                    if self.config_manager.get_boolean_setting('debug'):
-                        self._safe_display('display_loading',f"Timestamp fetch failed for {fork_owner}/{fork_name}:{branch_name} - {e}")
-                    branch_timestamp = None
+                # For state saving, we need the ORIGINAL commits to get the latest SHA
+                original_commits = self._transform_comparison_commits(comparison_commits)
+                
+                # Latest commit timestamp for this branch - the comparison ends at the branch head,
+                # so only ask the API when it returned no commits
+                branch_timestamp = latest_commit_timestamp(original_commits)
+                if not branch_timestamp:
+                    try:
+                        if self._cfg.debug:
+                            self._safe_display_loading(f"Fetching timestamp for {fork_owner}/{fork_name}:{branch_name}")
+                        branch_timestamp = self.fetcher.get_latest_commit_timestamp(fork_owner, fork_name, branch_name)
+                        if self._cfg.debug:
+                            self._safe_display_loading(f"Got timestamp: {branch_timestamp}")
+                    except Exception as e:
+                        if self._cfg.debug:
+                            self._safe_display_loading(f"Timestamp fetch failed for {fork_owner}/{fork_name}:{branch_name} - {e}")
+                        branch_timestamp = None
                 
                 # Check README modifications for this branch
                 if self.fetcher.readme_was_modified(comparison) and fork_readme is None:
-                    if self.config_manager.get_boolean_setting('debug'):
-                        self._safe_display('display_loading',f"README modified in {branch_name}, fetching...")
+                    if self._cfg.debug:
+                        self._safe_display_loading(f"README modified in {branch_name}, fetching...")
                     fork_readme = self.fetcher.get_readme(fork_owner, fork_name)
                 
                 # Use filtered commit count for accurate AI context
                 filtered_commits_count = len(branch_commits)
                 
                 # Always track this branch for state saving (even if 0 commits)
-                # For state saving, we need the ORIGINAL commits to get the latest SHA
-                original_commits = self._transform_comparison_commits(comparison_commits)
                 all_processed_branches.append({
                     'branch_name': branch_name,
                     'commits_ahead': filtered_commits_count,
@@ -323,9 +329,9 @@ class ForksProcessor(ParallelBaseProcessor):
         
         # Check if this fork needs processing based on state
         fork_name_full = f"{fork_owner}/{fork_name}"
-        save_state_enabled = self.config_manager.get_boolean_setting('save_state', True)
+        save_state_enabled = self._cfg.save_state
         if not StateManager.should_process_fork_by_state(self.state, repo_key, fork_name_full, branch_analyses, save_state_enabled):
-            if self.config_manager.get_boolean_setting('debug'):
+            if self._cfg.debug:
                 self._safe_display('debug',f"Skipping {fork_name_full} - no new commits across branches")
             return None
         
@@ -349,6 +355,7 @@ class ForksProcessor(ParallelBaseProcessor):
         return {
             'fork_name': fork_name_full,
             'fork_url': f"https://github.com/{fork_owner}/{fork_name}",
+            'default_branch': fork_default_branch,
             'commits_ahead': total_commits_ahead,
             'commits': all_commits[:max_commits],  # Use max_commits setting for overall summary
             'readme': fork_readme,
@@ -360,56 +367,53 @@ class ForksProcessor(ParallelBaseProcessor):
 
     def _should_process_fork_by_state(self, repo_key, fork_full_name, fork_basic_info):
         """Quick check if fork needs processing based on lightweight state comparison"""
-        save_state_enabled = self.config_manager.get_boolean_setting('save_state', True)
-        if not save_state_enabled:
+        if not self._cfg.save_state:
             return True
-            
+
         # For lightweight check without full branch analysis, use timestamp comparison
-        repo_state = self.state.get(repo_key, {})
-        processed_forks = repo_state.get('processed_forks', {})
-        
-        if fork_full_name not in processed_forks:
+        saved_fork_state = self.state.get(repo_key, {}).get('processed_forks', {}).get(fork_full_name)
+        if not saved_fork_state:
             return True  # New fork
-        
+
+        # pushed_at only moves on pushes (updated_at also moves on stars and settings) - exact, no clock skew
+        fork_pushed_at = fork_basic_info.get('pushed_at')
+        saved_pushed_at = saved_fork_state.get('last_pushed_at')
+        if fork_pushed_at and saved_pushed_at:
+            return fork_pushed_at > saved_pushed_at
+
         fork_last_update = fork_basic_info.get('updated_at')
-        if not fork_last_update:
-            return True  # Process if we can't determine last update
-        
-        # Compare with our last check time
-        saved_fork_state = processed_forks[fork_full_name]
         last_check = saved_fork_state.get('last_check')
-        
-        if not last_check:
-            return True  # Process if no previous check
-        
-        # Quick timestamp comparison (simplified version)
+        if not fork_last_update or not last_check:
+            return True  # Process if we can't determine last update or no previous check
+
+        # GitHub timestamps are UTC ('Z'); last_check is epoch seconds (or legacy local ISO) - compare as epochs
         try:
-            from datetime import datetime
             fork_update_time = datetime.fromisoformat(fork_last_update.replace('Z', '+00:00'))
-            last_check_time = datetime.fromisoformat(last_check)
-            return fork_update_time > last_check_time
-        except:
+            return fork_update_time.timestamp() > StateManager.check_timestamp(last_check)
+        except (ValueError, TypeError):
             return True  # Process if timestamp comparison fails
 
     def _process_fork_subset(self, forks_to_process, repo, owner, repo_name, parent_default_branch, max_branches_per_fork, min_commits_ahead, analyze_default_branch_always, max_commits, parent_readme, repo_key):
         """Process only the subset of forks that need processing"""
         ahead_forks = []
-        show_costs = self.config_manager.get_show_costs_setting()
+        show_costs = self._cfg.show_costs
         header_displayed = False
         
         for fork in forks_to_process:
             fork_owner = fork['owner']
             fork_name = fork['name']
-            fork_default_branch = fork.get('default_branch', 'main')
+            fork_default_branch = fork.get('default_branch') or 'main'
             
             # Process multi-branch analysis for this fork
             fork_analysis = self._process_fork_branches(
                 owner, repo_name, parent_default_branch, fork_owner, fork_name, fork_default_branch,
                 max_branches_per_fork, min_commits_ahead, analyze_default_branch_always,
-                max_commits, parent_readme, repo_key
+                max_commits, parent_readme, repo_key, fork.get('branches')
             )
             
             if fork_analysis:
+                # Saved with the fork state so the next run can skip the fork until it is pushed to again
+                fork_analysis['pushed_at'] = fork.get('pushed_at')
                 ahead_forks.append(fork_analysis)
                 
                 # Display header only once when first fork is found
@@ -439,7 +443,8 @@ class ForksProcessor(ParallelBaseProcessor):
                 
                 # Generate AI summary
                 try:
-                    result = self.generator.generate_summary(fork_data)
+                    # On the shared AI pool, so max_ai_workers bounds fork summaries too
+                    result = self._ai_pool.submit(self.generator.generate_summary, fork_data).result()
                     summary = result['summary']
                     
                     # Cost is already tracked by the AI provider during generation
@@ -456,14 +461,14 @@ class ForksProcessor(ParallelBaseProcessor):
                     )
                     
                     # Update state with this fork's analysis
-                    StateManager.update_fork_state(self.state, repo_key, fork_info)
+                    self._update_state(repo_key, StateManager.update_fork_state, fork_info)
                     
                 except Exception as e:
                     # Always log critical errors, not just in debug mode
-                    self._safe_display('error',f"❌ Summary generation failed for {fork_info['fork_name']}: {e}")
-                    if self.config_manager.get_boolean_setting('debug'):
+                    self._safe_display_error(f"❌ Summary generation failed for {fork_info['fork_name']}: {e}")
+                    if self._cfg.debug:
                         import traceback
-                        self._safe_display('error',f"Full traceback: {traceback.format_exc()}")
+                        self._safe_display_error(f"Full traceback: {traceback.format_exc()}")
         
         return ahead_forks
     
@@ -1,130 +1,347 @@
+import contextlib
 import subprocess
 import json
 import re
 import os
+import socket
+import threading
+import time
+import http.client
+from itertools import islice
+from urllib.parse import urlencode, quote
+from .response_cache import ResponseCache
+
+try:
+    from orjson import loads as _json_loads  # Optional: several times faster on large commit/compare payloads
+except ImportError:
+    _json_loads = json.loads
+
+
+API_HOST = 'api.github.com'
+MAX_PER_PAGE = 100  # GitHub's per_page ceiling for list endpoints
+METADATA_MAX_AGE = 24 * 60 * 60  # README and fork/parent metadata change on a scale of days
+RETRY_STATUSES = (429, 502, 503, 504)  # Secondary rate limits and gateway hiccups - worth another try
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # Seconds, doubled per attempt unless GitHub sends Retry-After
+MAX_RETRY_DELAY = 60
+REPO_BATCH_SIZE = 50  # Repositories per aliased GraphQL query - keeps each query well under node limits
+
+# owner/repo from a GitHub URL; tolerates a .git suffix, trailing slash or deeper path (/tree/...)
+_GH_URL_RE = re.compile(r'https://github\.com/([^/]+)/([^/]+?)(?:\.git)?(?:/|$)')
+_README_RE = re.compile('readme', re.IGNORECASE)
+
+# Commit fields mirroring the REST commit object's sha/message/author/committer (parents to drop merges)
+_COMPARE_COMMIT_FIELDS = ('oid message author { name email date } committer { name email date } '
+                          'parents(first: 2) { totalCount }')
+
+# One round trip (one rate-limit point) for the fork listing plus each fork's branch heads
+FORKS_QUERY = """
+query($owner: String!, $name: String!, $limit: Int!) {
+  repository(owner: $owner, name: $name) {
+    forks(first: $limit, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        name
+        nameWithOwner
+        owner { login }
+        isPrivate
+        updatedAt
+        pushedAt
+        defaultBranchRef { name target { oid } }
+        refs(refPrefix: "refs/heads/", first: 100, orderBy: {field: ALPHABETICAL, direction: ASC}) {
+          nodes { name target { oid } }
+        }
+      }
+    }
+  }
+}
+"""
 
 
 class GitHubFetcher:
-    def __init__(self, debug_logger=None):
-        """GitHub CLI fetcher - uses gh command for API access"""
+    def __init__(self, debug_logger=None, response_cache=None, max_inflight=None):
+        """GitHub REST API fetcher - uses gh CLI token, talks to api.github.com over persistent HTTPS
+        
+        max_inflight: cap on concurrent requests across all threads (None = unbounded)
+        """
         self.debug_logger = debug_logger
+        self._inflight = threading.BoundedSemaphore(max_inflight) if max_inflight else contextlib.nullcontext()
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()  # In-memory only
+        self._token = None
+        self._local = threading.local()
+        self._repo_cache = {}
+        self._repo_cache_lock = threading.Lock()
+        self._repo_fetch_locks = {}
+        self._compare_cache = {}
         self._setup_token_cache()
-        self._check_gh_auth()
     
     def _setup_token_cache(self):
-        """Enhanced token caching with validation and proper error handling"""
-        try:
-            result = subprocess.run(['gh', 'auth', 'token'], 
-                                   capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                token = result.stdout.strip()
-                if token and self._validate_token(token):
-                    os.environ['GH_TOKEN'] = token
-                    if self.debug_logger:
-                        self.debug_logger.debug("✅ Token caching successful")
-                else:
-                    if self.debug_logger:
-                        self.debug_logger.debug("⚠️  Token validation failed - using normal auth")
-            else:
-                if self.debug_logger:
+        """Resolve the API token once: GH_TOKEN if set, otherwise `gh auth token`"""
+        token = os.environ.get('GH_TOKEN', '').strip()
+        if not token:
+            try:
+                result = subprocess.run(['gh', 'auth', 'token'], 
+                                       capture_output=True, text=True, timeout=10)
+                if result.returncode == 0:
+                    token = result.stdout.strip()
+                elif self.debug_logger:
                     self.debug_logger.debug(f"⚠️  gh auth token failed: {result.stderr}")
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError) as e:
-            if self.debug_logger:
-                self.debug_logger.debug(f"⚠️  Token caching failed: {e}")
-            # Fallback to normal auth without caching
+            except (subprocess.TimeoutExpired, OSError) as e:
+                if self.debug_logger:
+                    self.debug_logger.debug(f"⚠️  Token lookup failed: {e}")
+        
+        # An invalid/expired token surfaces as a 401 on the first real request
+        if not token:
+            raise RuntimeError("GitHub CLI not authenticated. Run 'gh auth login'")
+        self._token = token
+        os.environ['GH_TOKEN'] = token
     
-    def _validate_token(self, token):
-        """Validate token works with a lightweight API call"""
-        try:
-            # Quick validation - check if token allows basic API access
-            result = subprocess.run(['gh', 'api', 'user'], 
-                                   capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError):
-            return False
+    def _get_connection(self, timeout):
+        """Get this thread's persistent HTTPS connection (keep-alive reuses the TLS session)"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(API_HOST, timeout=timeout)
+            self._local.connection = conn
+        elif conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.timeout = timeout
+        return conn
     
-    def _check_gh_auth(self):
-        """Verify gh CLI is authenticated"""
-        result = subprocess.run(['gh', 'auth', 'status'], 
-                               capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError("GitHub CLI not authenticated. Run 'gh auth login'")
+    def _reset_connection(self):
+        """Drop this thread's connection so the next request reconnects"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
     
-    def _run_gh_command(self, cmd, parse_json=True, timeout=30):
-        """Run gh command with error handling and optional JSON parsing"""
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        except subprocess.TimeoutExpired:
-            raise RuntimeError(f"GitHub CLI command timed out after {timeout}s: {' '.join(cmd)}")
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"GitHub CLI command failed: {result.stderr}")
-        
-        if parse_json and result.stdout.strip():
-            return json.loads(result.stdout)
-        return result.stdout if not parse_json else []
+    def _request(self, method, path, body=None, timeout=30, extra_headers=None):
+        """Send a request to the GitHub API and return (status, response_body_bytes, response_headers)"""
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'gh-utils',
+            'X-GitHub-Api-Version': '2022-11-28',
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+        if self._token:
+            headers['Authorization'] = f'Bearer {self._token}'
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        
+        reconnected = False
+        retries = 0
+        while True:
+            conn = self._get_connection(timeout)
+            try:
+                # Slot held for the exchange only - never across a retry backoff sleep
+                with self._inflight:
+                    conn.request(method, f'/{path}', body=payload, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+            except socket.timeout:
+                self._reset_connection()
+                raise RuntimeError(f"GitHub API request timed out after {timeout}s: {method} {path}")
+            except (http.client.HTTPException, OSError) as e:
+                # Server may have closed an idle keep-alive connection - reconnect once
+                self._reset_connection()
+                if reconnected:
+                    raise RuntimeError(f"GitHub API request failed: {method} {path}: {e}")
+                reconnected = True
+                continue
+            
+            if response.status in RETRY_STATUSES and retries < MAX_RETRIES:
+                retries += 1
+                time.sleep(self._retry_delay(response.headers, retries))
+                continue
+            return response.status, data, response.headers
+    
+    @staticmethod
+    def _retry_delay(headers, attempt):
+        """Seconds to wait before retrying a transient failure - Retry-After if given, else exponential backoff"""
+        retry_after = headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_DELAY)
+        return RETRY_BACKOFF * 2 ** (attempt - 1)
+    
+    def _get_body(self, path, params=None, timeout=30, accept=None, max_age=None):
+        """GET a GitHub API endpoint and return the decoded response text (None if empty)
+        
+        max_age: seconds a cached body is trusted without contacting GitHub at all
+        """
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        # Same URL under a different media type is a different representation
+        cache_key = f'{accept} {path}' if accept else path
+        
+        etag, cached_body, fetched_at = self.response_cache.get(cache_key)
+        if max_age and cached_body is not None and time.time() - fetched_at < max_age:
+            return cached_body
+        
+        # Conditional request: a 304 means our cached body is still current
+        extra_headers = {'If-None-Match': etag} if etag else {}
+        if accept:
+            extra_headers['Accept'] = accept
+        status, data, headers = self._request('GET', path, timeout=timeout, extra_headers=extra_headers)
+        if status == 304 and cached_body is not None:
+            # Restart the freshness window (max_age) and keep the entry clear of retention pruning
+            self.response_cache.put(cache_key, etag, cached_body)
+            return cached_body
+        self._raise_for_status(status, data)
+        if not data:
+            return None
+        body = data.decode('utf-8', errors='replace')
+        if headers.get('ETag'):
+            self.response_cache.put(cache_key, headers['ETag'], body)
+        return body
+    
+    def _get(self, path, params=None, timeout=30, max_age=None):
+        """GET a GitHub API endpoint and return the parsed JSON body"""
+        body = self._get_body(path, params, timeout, max_age=max_age)
+        return _json_loads(body) if body else None
     
-    def _run_gh_command_multiline_json(self, cmd, timeout=30):
-        """Run gh command and parse multiple JSON objects (one per line)"""
+    def _get_list(self, path, params=None, limit=None, timeout=30):
+        """GET a list endpoint, sizing pages server-side so we never download past `limit`
+        
+        Without a limit this is a single request with GitHub's default page size.
+        """
+        params = dict(params or {})
+        if not limit:
+            return self._get(path, params, timeout) or []
+        
+        per_page = min(limit, MAX_PER_PAGE)
+        params['per_page'] = per_page
+        items = []
+        page = 1
+        while len(items) < limit:
+            if page > 1:
+                params['page'] = page
+            batch = self._get(path, params, timeout) or []
+            items.extend(batch)
+            if len(batch) < per_page:
+                break  # Last page
+            page += 1
+        return items[:limit]
+    
+    def _get_sha(self, owner, repo, ref):
+        """Resolve a ref to its commit SHA; the sha media type returns the bare 40-char string (None if empty)"""
+        body = self._get_body(f'repos/{owner}/{repo}/commits/{self._ref(ref)}',
+                              accept='application/vnd.github.sha')
+        if not body:
+            return None
+        return body.strip() or None
+    
+    @staticmethod
+    def _raise_for_status(status, data):
+        """Raise RuntimeError carrying GitHub's message for an error response"""
+        if status < 400:
+            return
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        except subprocess.TimeoutExpired:
-            return []  # Return empty list for timeout instead of raising exception
-        
-        if result.returncode != 0:
-            return []  # Return empty list instead of raising exception
-        
-        objects = []
-        if result.stdout.strip():
-            for line in result.stdout.strip().split('\n'):
-                if line.strip():
-                    try:
-                        objects.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue  # Skip invalid JSON lines
-        return objects
+            message = json.loads(data).get('message', '')
+        except (ValueError, AttributeError):
+            message = data.decode('utf-8', errors='replace')
+        raise RuntimeError(f"GitHub API request failed: {message} (HTTP {status})")
+    
+    def graphql(self, query, variables=None, timeout=30, allow_partial=False):
+        """Run a GraphQL v4 query and return its data
+        
+        allow_partial: return the data even if some fields errored (those come back null), e.g. one
+        missing repository in a batched query; only a response without any data raises
+        """
+        status, data, _ = self._request('POST', 'graphql', body={'query': query, 'variables': variables or {}}, timeout=timeout)
+        self._raise_for_status(status, data)
+        result = _json_loads(data)
+        errors = result.get('errors')
+        if errors and not (allow_partial and result.get('data')):
+            raise RuntimeError(f"GitHub GraphQL query failed: {errors[0].get('message', '')}")
+        if errors and self.debug_logger:
+            self.debug_logger.debug(f"GraphQL partial result, {len(errors)} field(s) failed: {errors[0].get('message', '')}")
+        return result['data']
+    
+    @staticmethod
+    def _ref(name):
+        """Quote a branch/ref name for use inside an API path"""
+        return quote(name, safe='/')
+    
+    @staticmethod
+    def _fork_summary(fork):
+        """Reduce a fork object from the forks listing to the fields we use"""
+        return {
+            'name': fork['name'],
+            'full_name': fork['full_name'],
+            'owner': fork['owner']['login'],
+            'default_branch': fork.get('default_branch'),
+            'updated_at': fork.get('updated_at'),
+            'pushed_at': fork.get('pushed_at'),
+            'private': fork.get('private'),
+        }
+    
+    @staticmethod
+    def _branch_commit_summary(commit):
+        """Reduce a compare-API commit to sha + message/author/committer"""
+        return {
+            'sha': commit['sha'],
+            'commit': {
+                'message': commit['commit']['message'],
+                'author': commit['commit']['author'],
+                'committer': commit['commit']['committer'],
+            }
+        }
+    
+    @staticmethod
+    def _graphql_commit_summary(node):
+        """Reshape a GraphQL commit node like _branch_commit_summary does a REST one"""
+        return {
+            'sha': node['oid'],
+            'commit': {
+                'message': node['message'],
+                'author': node['author'],
+                'committer': node['committer'],
+            }
+        }
     
     def extract_owner_repo(self, url):
         """Extract owner/repo from GitHub URL"""
-        match = re.match(r'https://github.com/([^/]+)/([^/]+)', url)
+        match = _GH_URL_RE.match(url)
         if match:
             return match.group(1), match.group(2)
         raise ValueError(f"Invalid GitHub URL: {url}")
     
-    def get_commits(self, owner, repo, since=None, limit=10, branch=None):
-        """Fetch commits using gh CLI"""
-        if branch:
-            endpoint = f'repos/{owner}/{repo}/commits?sha={branch}&per_page={limit}'
-        else:
-            endpoint = f'repos/{owner}/{repo}/commits?per_page={limit}'
+    def get_commits(self, owner, repo, since=None, limit=10, branch=None, since_timestamp=None):
+        """Fetch commits from the REST API
         
-        cmd = ['gh', 'api', endpoint]
+        since: SHA to exclude from the result
+        since_timestamp: ISO 8601 date - the server only returns commits from that date on
+        """
+        params = {}
+        if branch:
+            params['sha'] = branch
+        if since_timestamp:
+            params['since'] = since_timestamp
+        commits = self._get_list(f'repos/{owner}/{repo}/commits', params, limit)
         if since:
-            cmd.extend(['--jq', f'map(select(.sha != "{since}"))[:{limit}]'])
-        else:
-            cmd.extend(['--jq', f'.[:{limit}]'])
-        
-        return self._run_gh_command(cmd)
+            commits = [c for c in commits if c['sha'] != since]
+        return commits
     
     def get_releases(self, owner, repo, limit=5):
-        """Fetch releases using gh CLI"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/releases?per_page={limit}', '--jq', f'.[:{limit}]']
-        return self._run_gh_command(cmd)
+        """Fetch releases from the REST API"""
+        return self._get_list(f'repos/{owner}/{repo}/releases', limit=limit)
     
     def get_latest_commit_sha(self, owner, repo):
-        """Get SHA of the latest commit using gh CLI"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/commits', '--jq', '.[0].sha']
-        result = self._run_gh_command(cmd, parse_json=False)
-        return result.strip().replace('"', '')
+        """Get SHA of the latest commit"""
+        try:
+            return self._get_sha(owner, repo, 'HEAD')
+        except RuntimeError:
+            return None  # Empty repository (409) or not accessible
     
     def get_latest_commit_timestamp(self, owner, repo, branch=None):
-        """Get timestamp of the latest commit using gh CLI"""
+        """Get timestamp of the latest commit"""
         if branch:
-            cmd = ['gh', 'api', f'repos/{owner}/{repo}/commits/{branch}', '--jq', '.commit.author.date']
+            commit = self._get(f'repos/{owner}/{repo}/commits/{self._ref(branch)}')
         else:
-            cmd = ['gh', 'api', f'repos/{owner}/{repo}/commits', '--jq', '.[0].commit.author.date']
-        result = self._run_gh_command(cmd, parse_json=False)
-        return result.strip().replace('"', '')
+            commits = self._get(f'repos/{owner}/{repo}/commits', {'per_page': 1})
+            commit = commits[0] if commits else None
+        return commit['commit']['author']['date'] if commit else None
     
     def get_latest_version(self, owner, repo):
         """Get the latest version from releases, fallback to tags"""
@@ -136,10 +353,9 @@ class GitHubFetcher:
             
             # Fallback to tags
             try:
-                cmd = ['gh', 'api', f'repos/{owner}/{repo}/tags', '--jq', '.[0].name']
-                result = self._run_gh_command(cmd, parse_json=False)
-                if result.strip():
-                    return result.strip().replace('"', '')
+                tags = self._get(f'repos/{owner}/{repo}/tags', {'per_page': 1})
+                if tags and tags[0].get('name'):
+                    return tags[0]['name']
             except RuntimeError:
                 pass
             
@@ -148,36 +364,20 @@ class GitHubFetcher:
             return None
     
     def get_forks(self, owner, repo, limit=20):
-        """Get active forks list with basic info using gh CLI"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/forks?per_page={limit}', 
-               '--jq', f'.[:{limit}] | .[] | {{name, full_name, owner: .owner.login, default_branch, updated_at, private}}']
-        
-        return self._run_gh_command_multiline_json(cmd)
+        """Get active forks list with basic info"""
+        forks = self._get_list(f'repos/{owner}/{repo}/forks', limit=limit)
+        return [self._fork_summary(fork) for fork in forks]
 
     
     def get_readme(self, owner, repo):
-        """Get README content for repository using gh CLI"""
-        # Try common README filenames
-        readme_files = ['README.md', 'README.rst', 'README.txt', 'README', 'readme.md', 'readme.rst', 'readme.txt', 'readme']
-        
-        for filename in readme_files:
-            try:
-                cmd = ['gh', 'api', f'repos/{owner}/{repo}/contents/{filename}', '--jq', '.content']
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-                if result.returncode == 0 and result.stdout.strip():
-                    # Content is base64 encoded, decode it
-                    import base64
-                    content = result.stdout.strip().replace('"', '')
-                    try:
-                        decoded_content = base64.b64decode(content).decode('utf-8')
-                        return decoded_content
-                    except Exception:
-                        # If decoding fails, return the encoded content
-                        return content
-            except (subprocess.TimeoutExpired, Exception):
-                continue
-        
-        return None  # No README found
+        """Get README content for repository"""
+        # The /readme endpoint resolves the canonical README whatever its filename;
+        # the raw media type returns the file itself instead of base64-wrapped JSON
+        try:
+            return self._get_body(f'repos/{owner}/{repo}/readme', timeout=15,
+                                  accept='application/vnd.github.raw', max_age=METADATA_MAX_AGE) or None
+        except RuntimeError:
+            return None  # No README found (404) or not accessible
     
     
     def readme_was_modified(self, comparison_result):
@@ -185,16 +385,14 @@ class GitHubFetcher:
         if not comparison_result or 'files' not in comparison_result:
             return False
         
-        readme_patterns = ['readme', 'README']
-        files = comparison_result.get('files', [])
-        
-        for file in files:
-            file_lower = file.lower()
-            for pattern in readme_patterns:
-                if pattern.lower() in file_lower:
-                    return True
-        
-        return False
+        return any(_README_RE.search(file) for file in comparison_result.get('files', []))
+    
+    @staticmethod
+    def _normalize_newlines(text):
+        """Convert CRLF/CR line endings to LF; LF-only text (the usual case) is returned untouched"""
+        if '\r' not in text:
+            return text
+        return text.replace('\r\n', '\n').replace('\r', '\n')
     
     def generate_readme_diff(self, parent_readme, fork_readme):
         """Generate unified diff showing what changed with context"""
@@ -208,8 +406,8 @@ class GitHubFetcher:
             return "Fork removed README."
         
         # Normalize content for comparison
-        parent_normalized = parent_readme.strip().replace('\r\n', '\n').replace('\r', '\n')
-        fork_normalized = fork_readme.strip().replace('\r\n', '\n').replace('\r', '\n')
+        parent_normalized = self._normalize_newlines(parent_readme.strip())
+        fork_normalized = self._normalize_newlines(fork_readme.strip())
         
         if parent_normalized == fork_normalized:
             return "No README changes."
@@ -220,6 +418,18 @@ class GitHubFetcher:
         parent_lines = parent_normalized.splitlines()
         fork_lines = fork_normalized.splitlines()
         
+        # Trim the common head and tail first - forks usually edit a few spots, so
+        # SequenceMatcher (quadratic in the worst case) only sees the region that differs
+        start = 0
+        shortest = min(len(parent_lines), len(fork_lines))
+        while start < shortest and parent_lines[start] == fork_lines[start]:
+            start += 1
+        end = 0
+        while end < shortest - start and parent_lines[-1 - end] == fork_lines[-1 - end]:
+            end += 1
+        parent_lines = parent_lines[start:len(parent_lines) - end]
+        fork_lines = fork_lines[start:len(fork_lines) - end]
+        
         # Generate diff with NO context to minimize output
         diff = list(difflib.unified_diff(
             parent_lines,
@@ -251,73 +461,114 @@ class GitHubFetcher:
         return '\n'.join(changes)
     
     def get_fork_branches(self, fork_owner, fork_repo, limit=None):
-        """Get all branches for a fork repository using gh CLI"""
+        """Get all branches for a fork repository"""
         return self.get_repository_branches(fork_owner, fork_repo, limit)
     
     def get_repository_branches(self, owner, repo, limit=None):
-        """Get all branches for any repository using gh CLI"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/branches']
-        if limit:
-            cmd.extend(['--jq', f'.[:{limit}] | .[] | {{name, commit: {{sha, url}}, protected}}'])
-        else:
-            cmd.extend(['--jq', '.[] | {name, commit: {sha, url}, protected}'])
-        
-        return self._run_gh_command_multiline_json(cmd)
+        """Get all branches for any repository"""
+        branches = self._get_list(f'repos/{owner}/{repo}/branches', limit=limit)
+        return [{
+            'name': b['name'],
+            'commit': {'sha': b['commit']['sha'], 'url': b['commit']['url']},
+            'protected': b.get('protected'),
+        } for b in branches]
     
     def compare_branch_with_parent(self, parent_owner, parent_repo, parent_branch, fork_owner, fork_repo, fork_branch):
-        """Compare specific fork branch with specific parent branch using gh CLI"""
-        cmd = ['gh', 'api', f'repos/{parent_owner}/{parent_repo}/compare/{parent_branch}...{fork_owner}:{fork_repo}:{fork_branch}',
-               '--jq', '{ahead_by, behind_by, status, commits: [.commits[] | {sha: .sha[0:7], message: .commit.message, author: .commit.author}], files: [.files[] | .filename]}']
+        """Compare specific fork branch with specific parent branch"""
+        endpoint = f'repos/{parent_owner}/{parent_repo}/compare/{self._ref(parent_branch)}...{fork_owner}:{fork_repo}:{self._ref(fork_branch)}'
         
         try:
-            return self._run_gh_command(cmd)
+            data = self._get_compare(endpoint)
         except RuntimeError:
-            # Branch comparison can fail for various reasons
+            # Branch comparison can fail for various reasons - one is a stale cached default branch
+            self._expire_repository(parent_owner, parent_repo)
             return {'ahead_by': 0, 'behind_by': 0, 'status': 'error', 'commits': [], 'files': []}
+        
+        return {
+            'ahead_by': data.get('ahead_by'),
+            'behind_by': data.get('behind_by'),
+            'status': data.get('status'),
+            'commits': [{
+                'sha': c['sha'][0:7],
+                'message': c['commit']['message'],
+                'author': c['commit']['author'],
+            } for c in data.get('commits', [])],
+            'files': [f['filename'] for f in data.get('files', [])],
+        }
     
     
+    def _get_compare(self, endpoint):
+        """Compare response, fetched once per run - the ahead count and the commit list come from the same call"""
+        data = self._compare_cache.get(endpoint)
+        if data is None:
+            data = self._compare_cache[endpoint] = self._get(endpoint)
+        return data
+    
+    def _get_repository(self, owner, repo):
+        """Repository metadata, fetched once per (owner, repo) - fork status and default branch don't change mid-run"""
+        key = f'{owner}/{repo}'.lower()
+        with self._repo_cache_lock:
+            if key in self._repo_cache:
+                return self._repo_cache[key]
+            key_lock = self._repo_fetch_locks.setdefault(key, threading.Lock())
+        
+        # Per-key lock so concurrent callers for the same repo share one request
+        with key_lock:
+            if key not in self._repo_cache:
+                self._repo_cache[key] = self._get(f'repos/{owner}/{repo}', max_age=METADATA_MAX_AGE)
+        return self._repo_cache[key]
+    
+    def _expire_repository(self, owner, repo):
+        """Stop trusting cached metadata once a call that relied on it failed (e.g. renamed default branch)"""
+        self.response_cache.expire(f'repos/{owner}/{repo}')
+    
+    def get_repo_pushed_at(self, owner, repo):
+        """Get the repository's pushed_at timestamp - always revalidated, never served from max_age"""
+        try:
+            data = self._get(f'repos/{owner}/{repo}')
+        except RuntimeError:
+            return None
+        if not data:
+            return None  # Empty body - nothing to report or memoize
+        # Fresh metadata doubles as the memoized copy for get_fork_info/get_default_branch
+        with self._repo_cache_lock:
+            self._repo_cache[f'{owner}/{repo}'.lower()] = data
+        return data.get('pushed_at')
+    
     def get_default_branch(self, owner, repo):
         """Get the default branch for a repository"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}', '--jq', '.default_branch']
         try:
-            result = self._run_gh_command(cmd, parse_json=False)
-            return result.strip().replace('"', '')
+            return self._get_repository(owner, repo)['default_branch']
         except RuntimeError:
             return 'main'  # Fallback to 'main' if we can't determine
     
     def get_branch_commits(self, owner, repo, branch_name, since=None, limit=10):
         """Get commits for a specific branch"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/commits', '--field', f'sha={branch_name}']
-        if since:
-            cmd.extend(['--jq', f'map(select(.sha != "{since}"))[:{limit}]'])
-        else:
-            cmd.extend(['--jq', f'.[:{limit}]'])
-        
-        return self._run_gh_command(cmd)
+        return self.get_commits(owner, repo, since=since, limit=limit, branch=branch_name)
     
-    def get_branch_commits_since_base(self, owner, repo, branch, base_branch, limit=None):
-        """Get commits in branch that are ahead of base branch (adaptive for forks/non-forks)"""
-        is_fork, parent_owner, parent_name = self.get_fork_info(owner, repo)
+    def get_branch_commits_since_base(self, owner, repo, branch, base_branch, limit=None, head_sha=None):
+        """Get commits in branch that are ahead of base branch (adaptive for forks/non-forks)
         
-        if limit:
-            # Filter out merge commits (parents.length > 1) for cleaner branch analysis
-            jq_filter = f'.commits | map(select(.parents | length == 1))[:{limit}] | map({{sha: .sha, commit: {{message: .commit.message, author: .commit.author, committer: .commit.committer}}}})'
-        else:
-            jq_filter = '.commits | map(select(.parents | length == 1)) | map({sha: .sha, commit: {message: .commit.message, author: .commit.author, committer: .commit.committer}})'
+        head_sha: branch head already known from a branch listing - same-repo compares use it
+        directly so the result matches the listed head
+        """
+        is_fork, parent_owner, parent_name = self.get_fork_info(owner, repo)
         
         if is_fork:
             # Cross-repository comparison for forks
-            cmd = ['gh', 'api', f'repos/{parent_owner}/{parent_name}/compare/{base_branch}...{owner}:{repo}:{branch}', '--jq', jq_filter]
+            endpoint = f'repos/{parent_owner}/{parent_name}/compare/{self._ref(base_branch)}...{owner}:{repo}:{self._ref(branch)}'
         else:
             # Same-repository comparison for non-forks
-            cmd = ['gh', 'api', f'repos/{owner}/{repo}/compare/{base_branch}...{branch}', '--jq', jq_filter]
+            endpoint = f'repos/{owner}/{repo}/compare/{self._ref(base_branch)}...{self._ref(head_sha or branch)}'
         
-        return self._run_gh_command(cmd)
+        # Filter out merge commits (more than one parent) for cleaner branch analysis -
+        # one lazy pass that stops at `limit` instead of building filtered and sliced copies
+        non_merge = (c for c in self._get_compare(endpoint)['commits'] if len(c['parents']) == 1)
+        return [self._branch_commit_summary(c) for c in islice(non_merge, limit or None)]
 
     def get_fork_info(self, owner, repo):
         """Check if repository is a fork and get parent info"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}', '--jq', '{fork: .fork, parent: .parent}']
-        result = self._run_gh_command(cmd)
+        result = self._get_repository(owner, repo)
         
         is_fork = result.get('fork', False)
         parent = result.get('parent')
@@ -326,57 +577,166 @@ class GitHubFetcher:
             return True, parent['owner']['login'], parent['name']
         return False, None, None
 
-    def get_branch_comparison(self, owner, repo, base_branch, compare_branch):
-        """Adaptive branch comparison: cross-repo for forks, same-repo for non-forks"""
+    def get_branch_comparison(self, owner, repo, base_branch, compare_branch, head_sha=None):
+        """Adaptive branch comparison: cross-repo for forks, same-repo for non-forks (head_sha as above)"""
         is_fork, parent_owner, parent_name = self.get_fork_info(owner, repo)
         
         try:
             if is_fork:
                 # Cross-repository comparison for forks (like forks module)
-                cmd = ['gh', 'api', f'repos/{parent_owner}/{parent_name}/compare/{base_branch}...{owner}:{repo}:{compare_branch}',
-                       '--jq', '{ahead_by: .ahead_by, behind_by: .behind_by}']
+                endpoint = f'repos/{parent_owner}/{parent_name}/compare/{self._ref(base_branch)}...{owner}:{repo}:{self._ref(compare_branch)}'
             else:
                 # Same-repository comparison for non-forks
-                cmd = ['gh', 'api', f'repos/{owner}/{repo}/compare/{base_branch}...{compare_branch}',
-                       '--jq', '{ahead_by: .ahead_by, behind_by: .behind_by}']
+                endpoint = f'repos/{owner}/{repo}/compare/{self._ref(base_branch)}...{self._ref(head_sha or compare_branch)}'
             
-            return self._run_gh_command(cmd)
+            data = self._get_compare(endpoint)
+            return {'ahead_by': data.get('ahead_by'), 'behind_by': data.get('behind_by')}
         except RuntimeError as e:
             # Handle orphan branches (no common ancestor) - treat as independent branches
             if "No common ancestor" in str(e):
                 return {'ahead_by': -1, 'behind_by': 0, 'is_orphan': True}
-            # Other errors - treat as no difference
+            # Other errors - treat as no difference, and revalidate the base repo's metadata next run
+            self._expire_repository(parent_owner or owner, parent_name or repo)
             return {'ahead_by': 0, 'behind_by': 0}
 
+    def get_branch_comparisons_batch(self, owner, repo, base_branch, branch_names, commit_limit=None):
+        """Compare several same-repo branches against base_branch in one GraphQL query
+        
+        Returns {branch_name: {'ahead_by', 'behind_by'}} for the branches GitHub could compare;
+        branches it could not (e.g. no common ancestor) are left out so callers fall back to
+        get_branch_comparison. Returns {} if the query fails.
+        
+        commit_limit: also return up to that many non-merge commits ahead of base (oldest first,
+        same shape as get_branch_commits_since_base) under 'commits'. Left out when merges crowd
+        the page, so callers fall back to the REST compare.
+        """
+        if not branch_names:
+            return {}
+        
+        variables = {'owner': owner, 'name': repo, 'base': f'refs/heads/{base_branch}'}
+        declarations = ['$owner: String!', '$name: String!', '$base: String!']
+        commit_fields = ''
+        if commit_limit:
+            # Merge commits are dropped afterwards, so ask for some slack
+            page_size = min(commit_limit * 2, MAX_PER_PAGE)
+            variables['first'] = page_size
+            declarations.append('$first: Int!')
+            commit_fields = f' commits(first: $first) {{ nodes {{ {_COMPARE_COMMIT_FIELDS} }} }}'
+        fields = []
+        for i, branch_name in enumerate(branch_names):
+            variables[f'h{i}'] = f'refs/heads/{branch_name}'
+            declarations.append(f'$h{i}: String!')
+            fields.append(f'b{i}: compare(headRef: $h{i}) {{ aheadBy behindBy{commit_fields} }}')
+        query = (f"query({', '.join(declarations)}) {{ repository(owner: $owner, name: $name) {{ "
+                 f"ref(qualifiedName: $base) {{ {' '.join(fields)} }} }} }}")
+        
+        try:
+            base_ref = (self.graphql(query, variables).get('repository') or {}).get('ref') or {}
+        except RuntimeError as e:
+            if self.debug_logger:
+                self.debug_logger.debug(f"GraphQL branch comparison failed, using REST: {e}")
+            return {}
+        
+        comparisons = {}
+        for i, branch_name in enumerate(branch_names):
+            result = base_ref.get(f'b{i}')
+            if not result:
+                continue
+            comparison = {'ahead_by': result['aheadBy'], 'behind_by': result['behindBy']}
+            if commit_limit:
+                nodes = (result.get('commits') or {}).get('nodes') or []
+                commits = [self._graphql_commit_summary(c) for c in nodes if c['parents']['totalCount'] == 1]
+                # A full page that still came up short may be hiding commits behind merges
+                if len(commits) >= commit_limit or len(nodes) < page_size:
+                    comparison['commits'] = commits[:commit_limit]
+            comparisons[branch_name] = comparison
+        return comparisons
+
+    def get_repository_heads_batch(self, repos):
+        """pushed_at, default branch and its head SHA for many repositories, REPO_BATCH_SIZE per GraphQL query
+        
+        repos: (owner, repo) pairs. Returns {'owner/repo' (lowercase): {'pushed_at', 'default_branch', 'head_sha'}};
+        repositories that errored (missing, renamed, inaccessible) or sat in a failed query are left out,
+        so callers fall back to the REST probes for just those.
+        """
+        repos = list(repos)
+        heads = {}
+        for start in range(0, len(repos), REPO_BATCH_SIZE):
+            chunk = repos[start:start + REPO_BATCH_SIZE]
+            variables = {}
+            declarations = []
+            fields = []
+            for i, (owner, repo) in enumerate(chunk):
+                variables[f'o{i}'], variables[f'n{i}'] = owner, repo
+                declarations.append(f'$o{i}: String!, $n{i}: String!')
+                fields.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ pushedAt defaultBranchRef {{ name target {{ oid }} }} }}')
+            query = f"query({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+            
+            try:
+                data = self.graphql(query, variables, allow_partial=True)
+            except RuntimeError as e:
+                if self.debug_logger:
+                    self.debug_logger.debug(f"GraphQL repository prefetch failed, using REST: {e}")
+                continue
+            
+            for i, (owner, repo) in enumerate(chunk):
+                node = data.get(f'r{i}')
+                if node:
+                    default_ref = node.get('defaultBranchRef') or {}
+                    heads[f'{owner}/{repo}'.lower()] = {
+                        'pushed_at': node.get('pushedAt'),
+                        'default_branch': default_ref.get('name'),
+                        'head_sha': (default_ref.get('target') or {}).get('oid'),
+                    }
+        return heads
+
     def get_branch_shas_only(self, owner, repo, limit=None):
         """Get lightweight branch list with only names and SHAs for performance optimization"""
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/branches']
-        if limit:
-            cmd.extend(['--jq', f'.[:{limit}] | .[] | {{name, commit: {{sha}}}}'])
-        else:
-            cmd.extend(['--jq', '.[] | {name, commit: {sha}}'])
-        
-        return self._run_gh_command_multiline_json(cmd)
+        branches = self._get_list(f'repos/{owner}/{repo}/branches', limit=limit)
+        return [{'name': b['name'], 'commit': {'sha': b['commit']['sha']}} for b in branches]
 
     def get_fork_last_commits(self, owner, repo, limit=None):
         """Get fork list with their default branch SHAs only for performance optimization"""
-        per_page = limit or 20
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/forks?per_page={per_page}']
-        if limit:
-            cmd.extend(['--jq', f'.[:{limit}] | .[] | {{owner: .owner.login, name, full_name, default_branch, updated_at, private}}'])
-        else:
-            cmd.extend(['--jq', '.[] | {owner: .owner.login, name, full_name, default_branch, updated_at, private}'])
+        forks = self._get_list(f'repos/{owner}/{repo}/forks', limit=limit or 20)
+        return [self._fork_summary(fork) for fork in forks]
+
+    def get_forks_bulk(self, owner, repo, limit=20):
+        """Get fork list with branch heads in a single GraphQL query (REST fallback)
         
-        return self._run_gh_command_multiline_json(cmd)
+        GraphQL results carry 'head_sha' and 'branches' (same shape as get_branch_shas_only),
+        so callers can skip a per-fork branch listing; the REST fallback omits both.
+        """
+        try:
+            data = self.graphql(FORKS_QUERY, {'owner': owner, 'name': repo, 'limit': min(limit, 100)})
+        except RuntimeError as e:
+            if self.debug_logger:
+                self.debug_logger.debug(f"GraphQL fork listing failed, using REST: {e}")
+            return self.get_fork_last_commits(owner, repo, limit)
+        
+        forks = []
+        for node in (data.get('repository') or {}).get('forks', {}).get('nodes', []):
+            default_ref = node.get('defaultBranchRef') or {}
+            forks.append({
+                'name': node['name'],
+                'full_name': node['nameWithOwner'],
+                'owner': node['owner']['login'],
+                'default_branch': default_ref.get('name'),
+                'updated_at': node.get('updatedAt'),
+                'pushed_at': node.get('pushedAt'),
+                'private': node.get('isPrivate'),
+                'head_sha': (default_ref.get('target') or {}).get('oid'),
+                'branches': [
+                    {'name': ref['name'], 'commit': {'sha': (ref.get('target') or {}).get('oid')}}
+                    for ref in (node.get('refs') or {}).get('nodes', [])
+                ],
+            })
+        return forks
 
 
     def get_current_main_sha(self, owner, repo):
         """Get current main/default branch SHA (lightweight check)"""
-        default_branch = self.get_default_branch(owner, repo)
-        cmd = ['gh', 'api', f'repos/{owner}/{repo}/branches/{default_branch}', '--jq', '.commit.sha']
+        # HEAD resolves to the default branch server-side - one round trip, ~40 bytes
         try:
-            result = self._run_gh_command(cmd, parse_json=False)
-            return result.strip().replace('"', '')
+            return self._get_sha(owner, repo, 'HEAD')
         except RuntimeError:
             return None
-
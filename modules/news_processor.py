@@ -1,66 +1,99 @@
+import time
+from heapq import nsmallest
+from operator import itemgetter
 from .parallel_base_processor import ParallelBaseProcessor
 from .repo_utils import RepoUtils
-from .commit_utils import filter_commits_since_last_processed
+from .commit_utils import filter_commits_since_last_processed, latest_commit_timestamp, reaches_commit
 from .state_manager import StateManager
 
 class NewsProcessor(ParallelBaseProcessor):
     """Processor for news summaries (commits and releases)"""
     
+    __slots__ = ('_repo_heads',)
+    
     def __init__(self, repositories=None, debug_override=None):
         super().__init__(template_name='summary', repositories=repositories, debug_override=debug_override)
+        self._repo_heads = {}  # repo_key -> {'pushed_at', 'head_sha'} from the batched prefetch
     
     @property
     def state_type(self):
         return 'news'
     
+    def _prefetch_repositories(self):
+        """PHASE 0/1 inputs (push timestamp, default branch and head SHA) for every repository in batched GraphQL queries"""
+        self._repo_heads = self.fetcher.get_repository_heads_batch(
+            (repo['_owner'], repo['_repo_name']) for repo in self.repos if repo['_owner']
+        )
+    
     def _process_repository(self, repo):
         """Optimized repository processing with early-exit state validation"""
-        from .url_utils import extract_repo_info
-        owner, repo_name, repo_key = extract_repo_info(repo['url'], self.fetcher, include_repo_key=True)
+        owner, repo_name, repo_key = repo['_owner'], repo['_repo_name'], repo['_repo_key']
+        save_state = self._cfg.save_state
+        debug = self._cfg.debug
+        
+        # Prefetched in one batch for all repositories; missing entries fall back to per-repository REST probes
+        prefetched = self._repo_heads.get(repo_key) or {}
+        
+        # PHASE 0: Nothing pushed since the last completed run - skip every other API read
+        pushed_at = prefetched.get('pushed_at') or self.fetcher.get_repo_pushed_at(owner, repo_name)
+        if save_state and StateManager.unchanged_since_last_push(self.state, repo_key, pushed_at):
+            if debug:
+                self._safe_display('display_no_updates', repo['name'])
+            return
         
         # PHASE 1: Quick repository state check (early exit optimization)
-        current_main_sha = self.fetcher.get_current_main_sha(owner, repo_name)
+        current_main_sha = prefetched.get('head_sha') or self.fetcher.get_current_main_sha(owner, repo_name)
         if not current_main_sha:
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('error', f"Could not get main branch SHA for {repo['name']}")
+            if debug:
+                self._safe_display_error(f"Could not get main branch SHA for {repo['name']}")
             return
         
+        # Resolved once and passed down. The default branch comes from the same prefetch/probe as the head
+        # SHA; fork status comes from repository metadata, which is fresh when the REST pushed_at probe ran
+        # and otherwise served from the metadata cache (METADATA_MAX_AGE) - it practically never changes.
+        default_branch = prefetched.get('default_branch') or self.fetcher.get_default_branch(owner, repo_name)
+        is_fork = self.fetcher.get_fork_info(owner, repo_name)[0]
+        
         # PHASE 2: Early exit if main branch unchanged and save_state enabled
-        if self.config_manager.get_boolean_setting('save_state', True):
-            if StateManager.main_branch_unchanged(self.state, repo_key, current_main_sha):
-                # Quick branch discovery for selective processing
-                current_branches = self.fetcher.get_branch_shas_only(owner, repo_name)
-                current_branch_shas = {b['name']: b['commit']['sha'] for b in current_branches}
-                
-                needs_processing, new_branches, changed_branches = StateManager.needs_repository_processing(
-                    self.state, repo_key, current_main_sha, current_branch_shas
-                )
-                
-                if not needs_processing:
-                    if self.config_manager.get_boolean_setting('debug'):
-                        self._safe_display('display_no_updates', repo['name'])
-                    return
-                
+        if save_state and StateManager.main_branch_unchanged(self.state, repo_key, current_main_sha):
+            # Quick branch discovery for selective processing
+            current_branches = self.fetcher.get_branch_shas_only(owner, repo_name)
+            current_branch_shas = {b['name']: b['commit']['sha'] for b in current_branches}
+            
+            needs_processing, new_branches, changed_branches = StateManager.needs_repository_processing(
+                self.state, repo_key, current_main_sha, current_branch_shas
+            )
+            
+            if not needs_processing:
+                if debug:
+                    self._safe_display('display_no_updates', repo['name'])
+            else:
                 # Process only changed/new branches (selective processing)
-                return self._process_selective_branches(repo, owner, repo_name, repo_key, new_branches, changed_branches, current_branch_shas)
+                self._process_selective_branches(repo, owner, repo_name, repo_key, new_branches, changed_branches, current_branch_shas, default_branch, is_fork)
+        else:
+            # PHASE 3: Fallback to full processing for changed main branch or no state
+            complete = self._process_full_repository(repo, owner, repo_name, repo_key, current_main_sha, default_branch, is_fork)
+            if not complete:
+                return  # Branch analysis failed - leave pushed_at unrecorded so the next run retries it
         
-        # PHASE 3: Fallback to full processing for changed main branch or no state
-        return self._process_full_repository(repo, owner, repo_name, repo_key, current_main_sha)
+        # Only a completed pass may vouch for this push timestamp (failures above raise or return early)
+        self._update_state(repo_key, StateManager.update_pushed_at, pushed_at)
 
-    def _process_full_repository(self, repo, owner, repo_name, repo_key, current_main_sha):
-        """Full repository processing (original logic)"""
-        last_commit = self.state.get(repo_key, {}).get('last_commit')
-        last_release = self.state.get(repo_key, {}).get('last_release')
+    def _process_full_repository(self, repo, owner, repo_name, repo_key, current_main_sha, default_branch, is_fork):
+        """Full repository processing (original logic); returns False if branch analysis failed"""
+        repo_state = self.state.get(repo_key) or {}
+        last_commit = repo_state.get('last_commit')
+        last_commit_date = repo_state.get('last_commit_date')
+        last_release = repo_state.get('last_release')
         
-        max_commits = self.config_manager.get_int_setting('max_commits', 10)
-        max_releases = self.config_manager.get_int_setting('max_releases', 10)
+        max_commits = self._cfg.max_commits
+        max_releases = self._cfg.max_releases
+        debug = self._cfg.debug
         
-        # Get default branch for comparison
-        default_branch = self.fetcher.get_default_branch(owner, repo_name)
+        # Releases are independent of the commit fetch - overlap the two round trips
+        releases_future = self._io_pool.submit(self.fetcher.get_releases, owner, repo_name, max_releases)
         
         # Adaptive commit fetching: cross-repo for forks, normal for non-forks
-        is_fork, parent_owner, parent_name = self.fetcher.get_fork_info(owner, repo_name)
-        
         if is_fork:
             # For forks: get commits on main that are ahead of parent (like forks module)
             all_fork_commits = self.fetcher.get_branch_commits_since_base(
@@ -68,22 +101,25 @@ class NewsProcessor(ParallelBaseProcessor):
             )
             # Filter commits to only show ones newer than last processed commit
             commits = filter_commits_since_last_processed(all_fork_commits, last_commit)
-            
+        
             # For forks, check if we have new commits ahead of parent since last run
             has_newer_commits = len(commits) > 0
         else:
             # For non-forks: get recent commits and filter properly
-            all_commits = self.fetcher.get_commits(owner, repo_name, limit=max_commits)
-            # Reverse order to match compare API format (oldest first)
-            all_commits.reverse()
-            commits = filter_commits_since_last_processed(all_commits, last_commit)
+            all_commits = self._get_commits_since(owner, repo_name, last_commit, last_commit_date, max_commits, current_main_sha)
+            # Commits API is newest first - the filter hands back compare API order (oldest first)
+            commits = filter_commits_since_last_processed(all_commits, last_commit, order='newest_first')
             has_newer_commits = len(commits) > 0
         
-        releases = self.fetcher.get_releases(owner, repo_name, limit=max_releases)
+        releases = releases_future.result()
+        
         has_newer_releases = RepoUtils.has_newer_releases(releases, last_release)
         
-        # Individual branch analysis
-        individual_branches = self._analyze_individual_branches(owner, repo_name, repo_key, default_branch)
+        # Individual branch analysis (None = failed; the main branch is still summarized below)
+        individual_branches = self._analyze_individual_branches(owner, repo_name, repo_key, default_branch, is_fork)
+        branches_complete = individual_branches is not None
+        if not branches_complete:
+            individual_branches = []
         
         # ENHANCED: Summary generation logic - includes main branch commits OR branch updates
         needs_summary = (
@@ -93,52 +129,51 @@ class NewsProcessor(ParallelBaseProcessor):
         )
         
         if needs_summary:
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('display_loading', f"Processing {repo['name']}...")
+            if debug:
+                self._safe_display_loading(f"Processing {repo['name']}...")
             
-            show_costs = self.config_manager.get_show_costs_setting()
+            show_costs = self._cfg.show_costs
             version = self.fetcher.get_latest_version(owner, repo_name)
             
-            # Get latest commit timestamp for headline
-            try:
-                last_commit_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name)
-            except Exception:
-                last_commit_timestamp = None
-            
             # Check if we have main branch updates
             has_main_updates = (has_newer_commits and commits) or (has_newer_releases and releases)
-            has_branch_updates = individual_branches and len(individual_branches) > 0
             
-            # Process main branch summary if needed
+            # All AI summaries for this repo (main first, then branches) in one concurrent batch
+            items = list(individual_branches)
             if has_main_updates:
-                repo_data = {
+                items.insert(0, {
                     'name': repo['name'],
                     'commits': commits if has_newer_commits else [],
                     'releases': releases if has_newer_releases else []
-                }
-                
-                result = self.generator.generate_summary(repo_data)
-                
-                # Display main repository summary with commit count
-                commit_count = len(commits) if has_newer_commits else 0
-                self._safe_display('display_news_summary',
-                    repo['name'], result['summary'], result.get('cost_info'),
-                    show_costs, repo['url'], version, None, last_commit_timestamp, commit_count
-                )
-            elif has_branch_updates:
-                # Branch-only updates: Display repository headline only (no timestamp for empty summary)
-                self._safe_display('display_news_summary',
-                    repo['name'], "", None,
-                    False, repo['url'], version, None, None
-                )
+                })
+            if debug:
+                for branch_data in individual_branches:
+                    self._safe_display_loading(f"Processing branch {branch_data['branch_name']}...")
+            results = self.generator.generate_summaries_batch(items, self._ai_pool)
+            branch_results = results[1:] if has_main_updates else results
             
-            # Process individual branch summaries
-            for branch_data in individual_branches:
-                if self.config_manager.get_boolean_setting('debug'):
-                    self._safe_display('display_loading', f"Processing branch {branch_data['branch_name']}...")
-                
-                result = self.generator.generate_summary(branch_data)
+            # Repository headline - branch-only updates get a bare headline (no summary, cost, timestamp or count)
+            summary_text, cost_info, headline_costs, last_commit_timestamp, commit_count = "", None, False, None, 0
+            if has_main_updates:
+                result = results[0]
+                summary_text, cost_info, headline_costs = result['summary'], result.get('cost_info'), show_costs
+                commit_count = len(commits) if has_newer_commits else 0
                 
+                # Latest commit timestamp for headline - read off the new commits, API only for release-only updates
+                last_commit_timestamp = latest_commit_timestamp(commits) if has_newer_commits else None
+                if not last_commit_timestamp:
+                    try:
+                        last_commit_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name)
+                    except Exception:
+                        last_commit_timestamp = None
+            
+            self._safe_display('display_news_summary',
+                repo['name'], summary_text, cost_info,
+                headline_costs, repo['url'], version, None, last_commit_timestamp, commit_count
+            )
+            
+            # Display individual branch summaries
+            for branch_data, result in zip(individual_branches, branch_results):
                 # Display individual branch summary
                 self._safe_display('display_branch_summary',
                     branch_data['branch_name'], 
@@ -151,117 +186,184 @@ class NewsProcessor(ParallelBaseProcessor):
                 )
         
         # Always update state if there's any processing (summary or not)
-        if (has_newer_commits and commits) or (has_newer_releases and releases) or (individual_branches and len(individual_branches) > 0):
+        if needs_summary:
             self._update_repository_state_with_individual_branches(
                 repo_key, has_newer_commits, has_newer_releases,
-                commits, releases, owner, repo_name, individual_branches
+                commits, releases, owner, repo_name, individual_branches, current_main_sha
             )
         else:
-            if self.config_manager.get_boolean_setting('debug'):
+            if debug:
                 self._safe_display('display_no_updates', repo['name'])
+        return branches_complete
 
-    def _analyze_individual_branches(self, owner, repo_name, repo_key, default_branch):
-        """Analyze repository branches individually for separate summaries"""
+    def _get_commits_since(self, owner, repo_name, last_commit, last_commit_date, limit, head_sha=None, branch=None):
+        """Recent commits (newest first) for the new-commit filter, narrowed by ?since= where that is safe
+        
+        The server-side date filter goes by committer date, which need not grow along history (old
+        commits pushed or fast-forwarded later, clock skew), so it can drop new commits. The filtered
+        page is only used if it links the head back to last_commit; otherwise it is fetched unfiltered.
+        """
+        if last_commit and last_commit_date:
+            commits = self.fetcher.get_commits(owner, repo_name, limit=limit, branch=branch, since_timestamp=last_commit_date)
+            if reaches_commit(commits, head_sha, last_commit):
+                return commits
+        return self.fetcher.get_commits(owner, repo_name, limit=limit, branch=branch)
+
+    def _analyze_individual_branches(self, owner, repo_name, repo_key, default_branch, is_fork=None):
+        """Analyze repository branches individually for separate summaries (None if the analysis failed)"""
+        debug = self._cfg.debug
         try:
             # Configuration
-            max_branches = self.config_manager.get_int_setting('max_branches_per_repo', 5)
-            min_commits = self.config_manager.get_int_setting('min_branch_commits', 1)
-            all_branches = self.fetcher.get_repository_branches(owner, repo_name, limit=max_branches * 2)
+            max_branches = self._cfg.max_branches
             
-            if not all_branches:
-                return []
+            if is_fork is None:
+                is_fork = self.fetcher.get_fork_info(owner, repo_name)[0]
             
-            # Filter non-default branches only (default branch handled separately)
-            candidate_branches = [b for b in all_branches if b['name'] != default_branch]
-            candidate_branches.sort(key=lambda x: x['name'])  # Consistent ordering
-            candidate_branches = candidate_branches[:max_branches]
+            # Debug label resolved once per repo rather than once per branch (None = no debug output)
+            comparison_type = None
+            if debug:
+                comparison_type = "cross-repo (fork)" if is_fork else "same-repo"
             
-            individual_branch_data = []
+            # Listing is alphabetical and at most one entry is the default branch - one spare is enough
+            all_branches = self.fetcher.get_repository_branches(owner, repo_name, limit=max_branches + 1)
             
-            for branch in candidate_branches:
-                branch_name = branch['name']
-                
-                # Get comparison data first (now uses adaptive logic)
-                comparison = self.fetcher.get_branch_comparison(owner, repo_name, default_branch, branch_name)
-                commits_ahead = comparison.get('ahead_by', 0)
-                is_orphan = comparison.get('is_orphan', False)
-                
-                # Handle orphan branches as independent branches (like main)
-                if is_orphan:
-                    commits_ahead = 1  # Treat as having commits to process
-                
-                # Get commits for AI analysis if branch has commits ahead or is orphan
-                if commits_ahead > 0:
-                    max_commits = self.config_manager.get_int_setting('max_commits', 10)
-                    
-                    if is_orphan:
-                        # For orphan branches, get commits directly (can't compare with base)
-                        all_branch_commits = self.fetcher.get_commits(
-                            owner, repo_name, limit=max_commits, branch=branch_name
-                        )
-                        # Reverse to match compare API format (oldest first)
-                        all_branch_commits.reverse()
-                    else:
-                        all_branch_commits = self.fetcher.get_branch_commits_since_base(
-                            owner, repo_name, branch_name, default_branch, limit=max_commits
-                        )
-                    
-                    # Filter branch commits based on saved state (same logic as main branch)
-                    repo_state = self.state.get(repo_key, {})
-                    branch_states = repo_state.get('branches', {})
-                    last_branch_commit = branch_states.get(branch_name, {}).get('last_commit')
-                    
-                    branch_commits = filter_commits_since_last_processed(all_branch_commits, last_branch_commit)
-                else:
-                    branch_commits = []
-                
-                # Debug actual commits fetched
-                if self.config_manager.get_boolean_setting('debug'):
-                    is_fork, parent_owner, parent_name = self.fetcher.get_fork_info(owner, repo_name)
-                    comparison_type = "cross-repo (fork)" if is_fork else "same-repo"
-                    self._safe_display('display_loading',f"Branch {branch_name}: {commits_ahead} commits ahead ({comparison_type})")
-                
-                if commits_ahead >= min_commits:
-                    # Check if needs processing (state-based)
-                    if self._should_process_branch(repo_key, branch_name, branch_commits):
-                        # Use filtered commits count (new commits since last check)
-                        actual_commits_count = len(branch_commits)
-                        
-                        # Get latest commit timestamp for this specific branch
-                        try:
-                            branch_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name, branch_name)
-                        except Exception:
-                            branch_timestamp = None
-                        
-                        # Prepare individual branch data for AI summary
-                        branch_data = {
-                            'name': f"{repo_name} - {branch_name} branch",
-                            'branch_name': branch_name,
-                            'commits_ahead': actual_commits_count,  # Use actual count
-                            'commits': branch_commits,
-                            'is_default': False,
-                            'parent_branch': default_branch,
-                            'last_commit_timestamp': branch_timestamp,
-                        }
-                        individual_branch_data.append(branch_data)
+            if not all_branches:
+                return []
             
-            return individual_branch_data
+            # Non-default branches only (default branch handled separately), first max_branches by name
+            # for consistent ordering - top-k selection rather than a full sort of a filtered copy
+            candidate_branches = nsmallest(
+                max_branches, (b for b in all_branches if b['name'] != default_branch), key=itemgetter('name')
+            )
+            
+            head_shas = {b['name']: b['commit']['sha'] for b in candidate_branches}
+            return self._analyze_branch_set(owner, repo_name, repo_key, default_branch, is_fork, head_shas, comparison_type)
             
         except Exception as e:
-            if self.config_manager.get_boolean_setting('debug'):
-                self._safe_display('error',f"Individual branch analysis failed for {repo_name}: {e}")
-            return []
+            if debug:
+                self._safe_display_error(f"Individual branch analysis failed for {repo_name}: {e}")
+            return None
+
+    def _analyze_branch_set(self, owner, repo_name, repo_key, default_branch, is_fork, head_shas, comparison_type=None):
+        """Analyze branches ({name: head SHA}, in display order) concurrently; returns branch data for summaries"""
+        min_commits = self._cfg.min_commits
+        max_commits = self._cfg.max_commits
+        
+        # Same-repo comparisons for all branches in one GraphQL round trip; forks compare
+        # across repositories, which GraphQL can't express, so they stay on REST per branch
+        comparisons = {}
+        if not is_fork:
+            comparisons = self.fetcher.get_branch_comparisons_batch(
+                owner, repo_name, default_branch, list(head_shas), commit_limit=max_commits
+            )
+        
+        # Saved per-branch state, looked up once for all branches
+        branch_states = (self.state.get(repo_key) or {}).get('branches') or {}
+        
+        # Branches are independent and I/O-bound - analyze them concurrently on the shared I/O pool (map keeps branch order)
+        settled = {}
+        results = self._io_pool.map(
+            lambda branch_name: self._analyze_one_branch(
+                branch_name, owner, repo_name, repo_key, default_branch,
+                min_commits, max_commits, branch_states, comparison_type, comparisons.get(branch_name),
+                head_shas[branch_name], settled
+            ),
+            head_shas
+        )
+        analyzed = [branch_data for branch_data in results if branch_data]
+        
+        # Moved heads with nothing ahead are recorded as they are, so the next run doesn't report them as
+        # new/changed again; summarized branches are saved by the caller once their summaries are shown
+        if settled:
+            self._update_state(repo_key, StateManager.apply_branch_delta, settled)
+        return analyzed
+
+    def _analyze_one_branch(self, branch_name, owner, repo_name, repo_key, default_branch, min_commits, max_commits, branch_states, comparison_type=None, comparison=None, head_sha=None, settled=None):
+        """Analyze a single branch against the default branch; returns branch data for a summary or None
+        
+        A branch whose head moved but has nothing ahead of the default branch is added to settled
+        ({name: head SHA}) so its new head can be recorded without a summary.
+        """
+        # Get comparison data first (now uses adaptive logic) unless the batch query already did
+        if comparison is None:
+            comparison = self.fetcher.get_branch_comparison(owner, repo_name, default_branch, branch_name, head_sha)
+        commits_ahead = comparison.get('ahead_by', 0)
+        is_orphan = comparison.get('is_orphan', False)
+        
+        # Handle orphan branches as independent branches (like main)
+        if is_orphan:
+            commits_ahead = 1  # Treat as having commits to process
+        
+        # Debug ahead count
+        if comparison_type:
+            self._safe_display_loading(f"Branch {branch_name}: {commits_ahead} commits ahead ({comparison_type})")
+        
+        # Cheap checks before the commit fetch: nothing (or too little) ahead, or head already processed
+        branch_state = branch_states.get(branch_name) or {}
+        last_branch_commit = branch_state.get('last_commit')
+        if head_sha and head_sha == last_branch_commit:
+            return None
+        if commits_ahead <= 0:
+            if head_sha and settled is not None:
+                settled[branch_name] = head_sha
+            return None
+        if commits_ahead < min_commits:
+            return None
+        
+        # Get commits for AI analysis (branch has commits ahead or is orphan)
+        if is_orphan:
+            # For orphan branches, get commits directly (can't compare with base);
+            # date-filtered like main where the page still links the head to the last processed commit
+            all_branch_commits = self._get_commits_since(
+                owner, repo_name, last_branch_commit, branch_state.get('last_commit_date'), max_commits,
+                head_sha, branch=head_sha or branch_name
+            )
+            commit_order = 'newest_first'
+        else:
+            # The batched GraphQL comparison usually brought the commits along already
+            all_branch_commits = comparison.get('commits')
+            if all_branch_commits is None:
+                all_branch_commits = self.fetcher.get_branch_commits_since_base(
+                    owner, repo_name, branch_name, default_branch, limit=max_commits, head_sha=head_sha
+                )
+            commit_order = 'oldest_first'
+        
+        # Filter branch commits based on saved state (same logic as main branch)
+        branch_commits = filter_commits_since_last_processed(all_branch_commits, last_branch_commit, order=commit_order)
+        
+        # Check if needs processing (state-based)
+        if not self._should_process_branch(repo_key, branch_name, branch_commits):
+            return None
+        
+        # Latest commit timestamp for this specific branch - already on the newest fetched commit
+        branch_timestamp = latest_commit_timestamp(branch_commits)
+        if not branch_timestamp:
+            try:
+                branch_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name, branch_name)
+            except Exception:
+                branch_timestamp = None
+        
+        # Prepare individual branch data for AI summary
+        return {
+            'name': f"{repo_name} - {branch_name} branch",
+            'branch_name': branch_name,
+            'commits_ahead': len(branch_commits),  # Use actual count (new commits since last check)
+            'commits': branch_commits,
+            'is_default': False,
+            'parent_branch': default_branch,
+            'last_commit_timestamp': branch_timestamp,
+        }
 
     def _should_process_branch(self, repo_key, branch_name, branch_commits):
         """Check if branch needs processing based on state"""
-        save_state_enabled = self.config_manager.get_boolean_setting('save_state', True)
+        save_state_enabled = self._cfg.save_state
         return StateManager.should_process_branch_by_state(
             self.state, repo_key, branch_name, branch_commits, save_state_enabled
         )
 
     def _should_process_fork_main(self, repo_key, fork_main_commits):
         """Check if fork's main branch needs processing (like forks module logic)"""
-        if not self.config_manager.get_boolean_setting('save_state', True):
+        if not self._cfg.save_state:
             return True
             
         if not fork_main_commits:
@@ -276,45 +378,45 @@ class NewsProcessor(ParallelBaseProcessor):
         current_latest = fork_main_commits[-1]['sha']
         return current_latest != saved_main_commit  # Has new commits ahead of parent
 
-    def _update_repository_state_with_individual_branches(self, repo_key, has_newer_commits, has_newer_releases, commits, releases, owner, repo_name, individual_branches):
+    def _update_repository_state_with_individual_branches(self, repo_key, has_newer_commits, has_newer_releases, commits, releases, owner, repo_name, individual_branches, current_main_sha=None):
         """Update state including individual branch tracking"""
-        # Update basic repository state
-        if has_newer_commits or has_newer_releases:
-            StateManager.update_basic_repository_state(
-                self.state, repo_key, 
-                commits if has_newer_commits else None,
-                releases if has_newer_releases else None,
-                self.fetcher, owner, repo_name
-            )
+        now = int(time.time())  # One timestamp for the repository and its branches
         
-        # Update individual branch states
-        if individual_branches:
-            for branch_data in individual_branches:
-                StateManager.update_branch_state(
-                    self.state, repo_key,
-                    branch_data['branch_name'],
-                    branch_data['commits'],
-                    branch_data['commits_ahead']
+        def update(state, repo_key):
+            # Update basic repository state
+            if has_newer_commits or has_newer_releases:
+                StateManager.update_basic_repository_state(
+                    state, repo_key, 
+                    commits if has_newer_commits else None,
+                    releases if has_newer_releases else None,
+                    self.fetcher, owner, repo_name,
+                    latest_sha=current_main_sha,  # Probed at the start of _process_repository
+                    now=now
                 )
+            
+            # Update individual branch states
+            StateManager.update_branch_states_bulk(state, repo_key, individual_branches, now=now)
+        
+        # Basic and branch state in one locked update - other repositories' workers share self.state
+        self._update_state(repo_key, update)
 
-    def _process_selective_branches(self, repo, owner, repo_name, repo_key, new_branches, changed_branches, current_branch_shas):
+    def _process_selective_branches(self, repo, owner, repo_name, repo_key, new_branches, changed_branches, current_branch_shas, default_branch, is_fork):
         """Process only specific branches that have changed or are new"""
-        if self.config_manager.get_boolean_setting('debug'):
-            self._safe_display('display_loading',f"Processing {len(new_branches)} new, {len(changed_branches)} changed branches for {repo['name']}")
+        debug = self._cfg.debug
+        if debug:
+            self._safe_display_loading(f"Processing {len(new_branches)} new, {len(changed_branches)} changed branches for {repo['name']}")
         
-        # Get default branch for comparison
-        default_branch = self.fetcher.get_default_branch(owner, repo_name)
-        
-        # Filter to only branches we care about (exclude default branch from individual analysis)
-        branches_to_process = [b for b in (new_branches + changed_branches) if b != default_branch]
+        # Filter to only branches we care about (exclude default branch from individual analysis),
+        # each branch once even if it is reported as both new and changed - order preserved
+        branches_to_process = list(dict.fromkeys(b for b in new_branches + changed_branches if b != default_branch))
         
         if not branches_to_process:
-            if self.config_manager.get_boolean_setting('debug'):
+            if debug:
                 self._safe_display('display_no_updates', repo['name'])
             return
         
         # Process only the subset that needs processing
-        individual_branches = self._process_branch_subset(branches_to_process, owner, repo_name, repo_key, default_branch, current_branch_shas)
+        individual_branches = self._process_branch_subset(branches_to_process, owner, repo_name, repo_key, default_branch, is_fork, current_branch_shas)
         
         if individual_branches:
             # Display repository headline only (no main branch summary)
@@ -324,13 +426,12 @@ class NewsProcessor(ParallelBaseProcessor):
             )
             
             # Process individual branch summaries
-            show_costs = self.config_manager.get_show_costs_setting()
-            for branch_data in individual_branches:
-                if self.config_manager.get_boolean_setting('debug'):
-                    self._safe_display('display_loading', f"Processing branch {branch_data['branch_name']}...")
-                
-                result = self.generator.generate_summary(branch_data)
-                
+            show_costs = self._cfg.show_costs
+            if debug:
+                for branch_data in individual_branches:
+                    self._safe_display_loading(f"Processing branch {branch_data['branch_name']}...")
+            results = self.generator.generate_summaries_batch(individual_branches, self._ai_pool)
+            for branch_data, result in zip(individual_branches, results):
                 # Display individual branch summary
                 self._safe_display('display_branch_summary',
                     branch_data['branch_name'], 
@@ -343,57 +444,13 @@ class NewsProcessor(ParallelBaseProcessor):
                 )
             
             # Update state for processed branches
-            for branch_data in individual_branches:
-                StateManager.update_branch_state(
-                    self.state, repo_key,
-                    branch_data['branch_name'],
-                    branch_data['commits'],
-                    branch_data['commits_ahead']
-                )
+            self._update_state(repo_key, StateManager.update_branch_states_bulk, individual_branches)
 
-    def _process_branch_subset(self, branches_to_process, owner, repo_name, repo_key, default_branch, current_branch_shas):
-        """Process a specific subset of branches"""
-        individual_branch_data = []
-        max_commits = self.config_manager.get_int_setting('max_commits', 10)
-        min_commits = self.config_manager.get_int_setting('min_branch_commits', 1)
-        
-        for branch_name in branches_to_process:
-            # Get comparison data first (now uses adaptive logic)
-            comparison = self.fetcher.get_branch_comparison(owner, repo_name, default_branch, branch_name)
-            commits_ahead = comparison.get('ahead_by', 0)
-            
-            # Get commits for AI analysis if branch has commits ahead
-            if commits_ahead > 0:
-                all_branch_commits = self.fetcher.get_branch_commits_since_base(
-                    owner, repo_name, branch_name, default_branch, limit=max_commits
-                )
-                
-                # Filter branch commits based on saved state
-                repo_state = self.state.get(repo_key, {})
-                branch_states = repo_state.get('branches', {})
-                last_branch_commit = branch_states.get(branch_name, {}).get('last_commit')
-                
-                branch_commits = filter_commits_since_last_processed(all_branch_commits, last_branch_commit)
-            else:
-                branch_commits = []
-            
-            if commits_ahead >= min_commits and branch_commits:
-                # Get latest commit timestamp for this specific branch
-                try:
-                    branch_timestamp = self.fetcher.get_latest_commit_timestamp(owner, repo_name, branch_name)
-                except Exception:
-                    branch_timestamp = None
-                
-                # Prepare individual branch data for AI summary
-                branch_data = {
-                    'name': f"{repo_name} - {branch_name} branch",
-                    'branch_name': branch_name,
-                    'commits_ahead': len(branch_commits),
-                    'commits': branch_commits,
-                    'is_default': False,
-                    'parent_branch': default_branch,
-                    'last_commit_timestamp': branch_timestamp,
-                }
-                individual_branch_data.append(branch_data)
-        
-        return individual_branch_data
\ No newline at end of file
+    def _process_branch_subset(self, branches_to_process, owner, repo_name, repo_key, default_branch, is_fork, current_branch_shas):
+        """Process a specific subset of branches (same concurrent per-branch analysis as the full path)"""
+        comparison_type = None
+        if self._cfg.debug:
+            comparison_type = "cross-repo (fork)" if is_fork else "same-repo"
+        
+        head_shas = {branch_name: current_branch_shas.get(branch_name) for branch_name in branches_to_process}
+        return self._analyze_branch_set(owner, repo_name, repo_key, default_branch, is_fork, head_shas, comparison_type)
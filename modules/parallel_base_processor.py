@@ -1,31 +1,96 @@
 import concurrent.futures
+import contextlib
+import copy
+import queue
 import threading
+import time
+from types import SimpleNamespace
+
+STATE_FLUSH_INTERVAL = 30  # Seconds between crash-safety journal flushes while repositories are processed
+STATE_LOCK_STRIPES = 8  # Unrelated repositories update in-memory state under different locks
+REPO_DEADLINE_POLL = 1.0  # Seconds between per-repository deadline checks while workers run
 
 class ParallelBaseProcessor:
     """Parallel base processor for repository processing with thread safety"""
     
+    # Fixed attribute set - slot access on the hot per-branch paths, no per-instance __dict__.
+    # Subclasses declare their own __slots__ (empty unless they add attributes).
+    __slots__ = (
+        'config_manager', '_cfg', 'repos', 'state', '_state_locks', '_state_write_lock', '_dirty_repos', '_abandoned_repos',
+        'fetcher', 'generator', 'display', '_display_methods', 'debug_logger',
+        '_log_queue', '_log_thread', '_flush_stopped', '_flush_timer', '_io_pool', '_ai_pool',
+    )
+    
     def __init__(self, template_name='summary', repositories=None, debug_override=None):
         """Initialize processor with components (same as BaseProcessor)"""
         from .config_manager import ConfigManager
         from .github_fetcher import GitHubFetcher
         from .summary_generator import SummaryGenerator
         from .display import TerminalDisplay
+        from .response_cache import ResponseCache
+        from .url_utils import extract_repo_info
         
         self.config_manager = ConfigManager('config.txt', debug_override=debug_override)
+        # Settings consulted per repository/branch, resolved once instead of re-parsed on every check
+        self._cfg = SimpleNamespace(
+            debug=self.config_manager.get_boolean_setting('debug'),
+            save_state=self.config_manager.get_boolean_setting('save_state', 'true'),
+            max_commits=self.config_manager.get_int_setting('max_commits', 10),
+            max_releases=self.config_manager.get_int_setting('max_releases', 10),
+            max_branches=self.config_manager.get_int_setting('max_branches_per_repo', 5),
+            min_commits=self.config_manager.get_int_setting('min_branch_commits', 1),
+            show_costs=self.config_manager.get_show_costs_setting(),
+            max_workers=self.config_manager.get_int_setting('max_workers', 4),
+            repo_timeout=self.config_manager.get_int_setting('repo_timeout', 60),
+            max_api_inflight=self.config_manager.get_int_setting('max_api_inflight', 8),
+            max_ai_workers=self.config_manager.get_int_setting('max_ai_workers', 4),
+        )
         self.repos = repositories or self.config_manager.load_repositories()
         self.state = self._load_state_if_enabled()
-        self._state_lock = threading.Lock()
-        self._repo_locks = {repo['name']: threading.Lock() for repo in self.repos}
+        self._state_locks = tuple(threading.Lock() for _ in range(STATE_LOCK_STRIPES))
+        self._state_write_lock = threading.Lock()  # Serializes file writes (periodic flush vs final save)
+        # Repository keys whose state may have changed since the last write - added under the repo's
+        # stripe (set.add is atomic), read and cleared under all stripes
+        self._dirty_repos = set()
+        # Repository keys past repo_timeout - their still-running workers may no longer write state
+        self._abandoned_repos = set()
+        # Periodic journal flusher, armed by execute() (flushes outside a run journal unconditionally)
+        self._flush_stopped = threading.Event()
+        self._flush_timer = None
         
         # Initialize components with error handling
         try:
             debug_logger = getattr(self, 'debug_logger', None)
-            self.fetcher = GitHubFetcher(debug_logger=debug_logger)
+            # Response cache persists next to the state files, and only when state is saved
+            cache_path = None
+            if self._cfg.save_state:
+                cache_path = self.config_manager.get_response_cache_filename()
+            self.fetcher = GitHubFetcher(
+                debug_logger=debug_logger, response_cache=ResponseCache(cache_path),
+                # Repository workers and their branch fan-out share one budget of concurrent API calls
+                max_inflight=self._cfg.max_api_inflight
+            )
             self.generator = SummaryGenerator(self.config_manager, template_name)
             self.display = TerminalDisplay()
         except RuntimeError as e:
             print(f"❌ Setup Error: {e}")
             raise
+        # Bound display methods by name for _safe_display ('error'/'debug' are plain prints)
+        self._display_methods = {
+            name: getattr(self.display, name) for name in dir(self.display) if name.startswith('display_')
+        }
+        self._display_methods['error'] = self._display_methods['debug'] = print
+        
+        # Parse each repository URL once up front; workers read the parts off the repo dict
+        unique_repos = {}
+        for repo in self.repos:
+            repo['_owner'], repo['_repo_name'], repo['_repo_key'] = extract_repo_info(
+                repo['url'], self.fetcher, include_repo_key=True
+            )
+            unique_repos.setdefault(repo['_repo_key'], repo)
+        # One worker per repository key - that single ownership is what lets _process_repository_safe run
+        # without a per-repository lock (duplicate config entries would otherwise race on one state entry)
+        self.repos = list(unique_repos.values())
     
     @property
     def state_type(self):
@@ -34,17 +99,20 @@ class ParallelBaseProcessor:
     
     def _load_state_if_enabled(self):
         """Load state if save_state is enabled"""
-        if self.config_manager.get_boolean_setting('save_state', 'true'):
+        if self._cfg.save_state:
             return self.config_manager.load_state(self.state_type)
         return {}
     
     def _save_state_if_enabled(self):
         """Save state if save_state is enabled"""
-        if self.config_manager.get_boolean_setting('save_state', 'true'):
+        if self._cfg.save_state:
             try:
-                with self._state_lock:
-                    self.config_manager.save_state(self.state, self.state_type)
-                if self.config_manager.get_boolean_setting('debug'):
+                # Only the snapshot holds the state locks; serialization runs while workers keep mutating state
+                with self._all_state_locks():
+                    snapshot = copy.deepcopy(self.state)
+                with self._state_write_lock:
+                    self.config_manager.save_state(snapshot, self.state_type)
+                if self._cfg.debug:
                     print("✅ State saved successfully")
             except Exception as e:
                 print(f"⚠️  Warning: Could not save state: {e}")
@@ -55,64 +123,207 @@ class ParallelBaseProcessor:
             self.display.display_error("No repositories configured in config.txt")
             return
         
-        max_workers = min(len(self.repos), self.config_manager.get_int_setting('max_workers', 4))
-        repo_timeout = self.config_manager.get_int_setting('repo_timeout', 60)
+        max_workers = min(len(self.repos), self._cfg.max_workers)
+        repo_timeout = self._cfg.repo_timeout
+        
+        # Workers hand output to a single printer thread instead of contending on a display lock;
+        # one consumer also keeps each multi-line block contiguous
+        self._log_queue = queue.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._log_loop, name='display', daemon=True)
+        self._log_thread.start()
         
-        # Initialize display lock for thread-safe output
-        self._display_lock = threading.Lock()
+        # State is written once at the end; the periodic flush only bounds what a crash can lose
+        self._flush_stopped.clear()
+        if self._cfg.save_state:
+            self._schedule_state_flush()
+        
+        # One pool for the fan-out inside a repository (branch comparisons, side fetches), shared by all
+        # repository workers instead of spinning up fresh threads per repository. Tasks on it never wait
+        # on the repository pool, so the two can't deadlock. Its tasks are API calls, so threads beyond
+        # the in-flight API budget would only park on the fetcher's semaphore (0 = unbounded budget).
+        io_threads = self._cfg.max_api_inflight or max_workers * 4
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix='io')
+        # Every AI summary call of the run goes through this pool, so max_ai_workers bounds the concurrent
+        # CLI subprocesses / HTTP calls across all repository workers (its tasks never wait on other pools)
+        self._ai_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, self._cfg.max_ai_workers), thread_name_prefix='ai'
+        )
+        
+        self._prefetch_repositories()
         
         # Process repositories in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        abandoned = False
+        try:
+            started_at = {}  # repo_key -> monotonic time a worker picked the repository up
             future_to_repo = {
-                executor.submit(self._process_repository_safe, repo): repo 
+                executor.submit(self._process_repository_safe, repo, started_at): repo
                 for repo in self.repos
             }
             
-            # Wait for completion with timeout
-            for future in concurrent.futures.as_completed(future_to_repo, timeout=180):
-                repo = future_to_repo[future]
-                try:
-                    future.result(timeout=repo_timeout)
-                except Exception as e:
-                    self._safe_display('error', f"❌ {repo['name']}: {e}")
+            # The timeout is per repository and counts from when a worker starts it, so queued
+            # repositories aren't charged for their wait. Threads can't be killed: a repository past
+            # its deadline is reported and abandoned, and the run finishes without it.
+            pending = set(future_to_repo)
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=REPO_DEADLINE_POLL, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self._safe_display_error(f"❌ {future_to_repo[future]['name']}: {e}")
+                
+                now = time.monotonic()
+                for future in [f for f in pending
+                               if now - started_at.get(future_to_repo[f]['_repo_key'], now) > repo_timeout]:
+                    pending.discard(future)
+                    abandoned = True
+                    # Freeze the repository's state: updates it finished stay, later ones are dropped
+                    repo_key = future_to_repo[future]['_repo_key']
+                    with self._state_lock_for(repo_key):
+                        self._abandoned_repos.add(repo_key)
+                    self._safe_display_error(f"❌ {future_to_repo[future]['name']}: timed out after {repo_timeout}s")
+        finally:
+            executor.shutdown(wait=not abandoned, cancel_futures=True)
+            self._io_pool.shutdown(wait=False)
+            self._ai_pool.shutdown(wait=False)
+            # cancel() doesn't stop a flush that is already running - wait for it, so no journal append
+            # can land after the final save below has folded in and removed the journal
+            self._flush_stopped.set()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer.join()
+            # Drain queued output before the end-of-run messages
+            self._log_queue.put(None)
+            self._log_thread.join()
         
         # Final state save
-        self._save_state_if_enabled()
+        self._flush_dirty_state(final=True)
+        self._save_response_cache()
+    
+    def _prefetch_repositories(self):
+        """Batched lookups for all repositories before the workers start (override in subclasses)"""
+    
+    def _schedule_state_flush(self):
+        """Arm a one-shot timer for the next periodic state flush"""
+        self._flush_timer = threading.Timer(STATE_FLUSH_INTERVAL, self._periodic_state_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _periodic_state_flush(self):
+        """Flush state mid-run and re-arm until execute() stops the flusher"""
+        if self._flush_stopped.is_set():
+            return
+        self._flush_dirty_state()
+        if not self._flush_stopped.is_set():
+            self._schedule_state_flush()
+    
+    def _flush_dirty_state(self, final=False):
+        """Persist the repositories touched since the last write
+        
+        Mid-run flushes append only those entries to the state journal; the final flush rewrites
+        the state file once, which folds in and removes the journal.
+        """
+        if not self._cfg.save_state:
+            return
+        with self._all_state_locks():
+            dirty = list(self._dirty_repos)
+            self._dirty_repos.clear()
+            deltas = {} if final else {key: copy.deepcopy(self.state[key]) for key in dirty if key in self.state}
+        
+        if final:
+            if dirty or self.config_manager.has_state_journal(self.state_type):
+                self._save_state_if_enabled()
+        elif deltas:
+            journaled = False
+            with self._state_write_lock:
+                # Stopped since the deltas were taken: the final save writes these entries itself, and
+                # appending them now could recreate the journal it has already removed
+                if not self._flush_stopped.is_set():
+                    try:
+                        self.config_manager.append_state_journal(deltas, self.state_type)
+                        journaled = True
+                    except Exception as e:
+                        # Runs on the flush timer thread - queued like worker output, never interleaved
+                        self._safe_display_error(f"⚠️  Warning: Could not journal state: {e}")
+            if not journaled:
+                # Keep them dirty so the next flush (or the final save) still persists them
+                with self._all_state_locks():
+                    self._dirty_repos.update(dirty)
+    
+    def _update_state(self, repo_key, update, *args, **kwargs):
+        """Apply update(state, repo_key, *args, **kwargs) under the repository's lock and mark it dirty
+        
+        Each call is one complete update. Once a repository is abandoned past repo_timeout its worker
+        keeps running, but its further updates are dropped - the final save can't race with them or
+        pick up half of a repository's changes.
+        """
+        with self._state_lock_for(repo_key):
+            if repo_key in self._abandoned_repos:
+                return
+            update(self.state, repo_key, *args, **kwargs)
+            self._dirty_repos.add(repo_key)
+    
+    def _state_lock_for(self, repo_key):
+        """Lock guarding one repository's in-memory state (striped by key)"""
+        return self._state_locks[hash(repo_key) % STATE_LOCK_STRIPES]
+    
+    @contextlib.contextmanager
+    def _all_state_locks(self):
+        """Hold every stripe, always in the same order, for whole-state reads"""
+        with contextlib.ExitStack() as stack:
+            for lock in self._state_locks:
+                stack.enter_context(lock)
+            yield
+    
+    def _save_response_cache(self):
+        """Persist the ETag cache so the next run can revalidate instead of re-downloading"""
+        try:
+            self.fetcher.response_cache.save()
+        except OSError as e:
+            if self._cfg.debug:
+                print(f"⚠️  Warning: Could not save response cache: {e}")
     
-    def _process_repository_safe(self, repo):
-        """Thread-safe wrapper for _process_repository with per-repo locking"""
-        repo_name = repo['name']
-        with self._repo_locks[repo_name]:
+    def _process_repository_safe(self, repo, started_at=None):
+        """Error-isolating wrapper for _process_repository (each repository is submitted exactly once)"""
+        if started_at is not None:
+            started_at[repo['_repo_key']] = time.monotonic()  # Starts the repository's repo_timeout clock
+        try:
+            self._process_repository(repo)
+        except Exception as e:
+            # An abandoned repository was already reported as timed out; its late failures (e.g. the
+            # shut-down I/O pool) are noise
+            if repo['_repo_key'] not in self._abandoned_repos:
+                self._safe_display_error(f"❌ Repository {repo['name']} failed: {e}")
+    
+    def _log_loop(self):
+        """Printer thread: run queued display calls in order until the None sentinel"""
+        while True:
+            item = self._log_queue.get()
+            if item is None:
+                return
+            method, args, kwargs = item
             try:
-                self._process_repository(repo)
-                # Save state immediately after successful processing
-                self._save_repository_state(repo)
+                method(*args, **kwargs)
             except Exception as e:
-                self._safe_display('error', f"❌ Repository {repo_name} failed: {e}")
+                print(f"⚠️  Warning: Display failed: {e}")
     
     def _safe_display(self, method_name, *args, **kwargs):
-        """Generic thread-safe display wrapper"""
-        with self._display_lock:
-            if hasattr(self.display, method_name):
-                method = getattr(self.display, method_name)
-                method(*args, **kwargs)
-            elif method_name in ['error', 'debug']:
-                # Handle print-based methods
-                print(*args)
-            else:
-                raise AttributeError(f"Display method '{method_name}' not found")
-    
-    def _save_repository_state(self, repo):
-        """Save state for individual repository immediately after processing"""
-        if self.config_manager.get_boolean_setting('save_state', 'true'):
-            try:
-                with self._state_lock:
-                    self.config_manager.save_state(self.state, self.state_type)
-                if self.config_manager.get_boolean_setting('debug'):
-                    self._safe_display('debug', f"✅ State saved for {repo['name']}")
-            except Exception as e:
-                self._safe_display('error', f"⚠️  Warning: Could not save state for {repo['name']}: {e}")
+        """Generic thread-safe display wrapper (queued for the printer thread)"""
+        method = self._display_methods.get(method_name)
+        if method is None:
+            raise AttributeError(f"Display method '{method_name}' not found")
+        self._log_queue.put((method, args, kwargs))
+    
+    def _safe_display_loading(self, message):
+        """Thread-safe progress line (direct call, no name dispatch)"""
+        self._log_queue.put((self.display.display_loading, (message,), {}))
     
+    def _safe_display_error(self, message):
+        """Thread-safe plain error line (direct call, no name dispatch)"""
+        self._log_queue.put((print, (message,), {}))
     
     def _process_repository(self, repo):
         """Subclass-specific repository processing logic (override in subclasses)"""
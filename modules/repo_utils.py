@@ -20,8 +20,8 @@ class RepoUtils:
     def has_newer_releases(releases, last_release):
         """Check if there are newer releases than last processed"""
         if releases and last_release:
-            latest_release_id = releases[0]['id']
-            return str(latest_release_id) != str(last_release)
+            # Saved release IDs are always str(id) (see StateManager.update_basic_repository_state)
+            return str(releases[0]['id']) != last_release
         elif releases and not last_release:
             return True  # First run with releases
         return False
@@ -0,0 +1,85 @@
+"""Persistent response cache for conditional GitHub API requests"""
+
+import sqlite3
+import threading
+import time
+
+# Entries not fetched or revalidated for this long are pruned on save. URLs keyed by head SHAs or
+# since= dates are never requested again, so without pruning the database only grows.
+RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class ResponseCache:
+    """SQLite-backed map of request URL -> (etag, body, fetched_at).
+
+    Entries let unchanged resources be revalidated with If-None-Match (GitHub's
+    304 Not Modified does not count against the primary rate limit), and let
+    slow-moving resources be served without any request while still fresh.
+    Writes are buffered in memory and flushed in one transaction by save(), which also prunes
+    entries older than RETENTION_SECONDS. With path=None the cache only lives for the current process.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._db = None
+        self._open()
+
+    def _open(self):
+        """Open (or create) the cache database; an unusable cache just disables persistence"""
+        if not self.path:
+            return
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL: the end-of-run flush appends instead of rewriting pages, and a news run reading the
+            # cache is not blocked by a forks run writing it
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses('
+                'url TEXT PRIMARY KEY, etag TEXT, body TEXT, fetched_at INTEGER)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses(fetched_at)')
+            self._db.commit()
+        except (OSError, sqlite3.Error):
+            self._db = None
+
+    def get(self, url):
+        """Return (etag, body, fetched_at) for a URL, or (None, None, None) if not cached"""
+        with self._lock:
+            entry = self._pending.get(url)
+            if entry is None and self._db is not None:
+                try:
+                    entry = self._db.execute(
+                        'SELECT etag, body, fetched_at FROM responses WHERE url = ?', (url,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    entry = None
+        return entry or (None, None, None)
+
+    def put(self, url, etag, body):
+        """Remember the ETag and decoded body of a response, stamped with the current time"""
+        with self._lock:
+            self._pending[url] = (etag, body, int(time.time()))
+
+    def expire(self, url):
+        """Mark an entry stale so the next read revalidates it (the ETag is kept for a cheap 304)"""
+        etag, body, _ = self.get(url)
+        if body is not None:
+            with self._lock:
+                self._pending[url] = (etag, body, 0)
+
+    def save(self):
+        """Flush buffered entries to disk and prune stale ones, in a single transaction"""
+        with self._lock:
+            if self._db is None:
+                return
+            rows = [(url, etag, body, fetched_at) for url, (etag, body, fetched_at) in self._pending.items()]
+            with self._db:
+                # Prune first: entries this run expired (fetched_at 0) are re-inserted below and keep their ETag
+                self._db.execute('DELETE FROM responses WHERE fetched_at < ?', (int(time.time()) - RETENTION_SECONDS,))
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO responses(url, etag, body, fetched_at) VALUES (?, ?, ?, ?)', rows
+                )
+            self._pending.clear()
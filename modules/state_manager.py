@@ -1,12 +1,36 @@
 """Shared utilities for repository state management"""
 
+import time
 from datetime import datetime
+from types import MappingProxyType
+
+# Shared read-only default for state lookups - readers never allocate a placeholder dict on a miss
+_EMPTY = MappingProxyType({})
+
+
+def _latest_ahead_sha(branch_analysis):
+    """Newest ahead commit of a fork branch - original_commits first, so it is known even when filtered to 0"""
+    commits = branch_analysis.get('original_commits') or branch_analysis['commits']
+    return commits[-1]['sha'] if commits else None
+
 
 class StateManager:
     """Utility for managing repository state updates"""
     
     @staticmethod
-    def update_basic_repository_state(state, repo_key, commits=None, releases=None, fetcher=None, owner=None, repo_name=None):
+    def check_timestamp(value):
+        """
+        Epoch seconds of a saved last_check-style value
+        
+        Timestamps are written as int epoch seconds; state from older versions holds naive
+        local-time ISO strings, which are read as local time.
+        """
+        if isinstance(value, (int, float)):
+            return value
+        return datetime.fromisoformat(value).timestamp()
+    
+    @staticmethod
+    def update_basic_repository_state(state, repo_key, commits=None, releases=None, fetcher=None, owner=None, repo_name=None, latest_sha=None, now=None):
         """
         Update basic repository state with commits and releases
         
@@ -18,13 +42,22 @@ class StateManager:
             fetcher: GitHubFetcher instance (optional, for getting latest commit SHA)
             owner: Repository owner (required if fetcher provided)
             repo_name: Repository name (required if fetcher provided)
+            latest_sha: Already-known head SHA (skips the fetcher lookup)
+            now: Epoch-seconds timestamp shared with the caller's other updates (defaults to the current time)
         """
-        updated_state = state.get(repo_key, {})
-        updated_state['last_check'] = datetime.now().isoformat()
+        updated_state = state.setdefault(repo_key, {})
+        updated_state['last_check'] = now or int(time.time())
         
         # Update commit state
         if commits:
-            if fetcher and owner and repo_name:
+            # Commit date of the newest processed commit - lets the next run ask the API for ?since=
+            latest_commit_date = commits[-1].get('commit', {}).get('committer', {}).get('date')
+            if latest_commit_date:
+                updated_state['last_commit_date'] = latest_commit_date
+            
+            if latest_sha:
+                updated_state['last_commit'] = latest_sha
+            elif fetcher and owner and repo_name:
                 # Use fetcher to get the actual latest commit SHA
                 latest_sha = fetcher.get_latest_commit_sha(owner, repo_name)
                 updated_state['last_commit'] = latest_sha
@@ -36,8 +69,6 @@ class StateManager:
         if releases:
             latest_release_id = releases[0]['id']
             updated_state['last_release'] = str(latest_release_id)
-        
-        state[repo_key] = updated_state
     
     @staticmethod
     def update_branch_state(state, repo_key, branch_name, branch_commits, commits_ahead):
@@ -51,20 +82,67 @@ class StateManager:
             branch_commits: List of commits for this branch
             commits_ahead: Number of commits ahead
         """
-        current_state = state.get(repo_key, {})
-        
-        if 'branches' not in current_state:
-            current_state['branches'] = {}
+        now = int(time.time())
+        current_state = state.setdefault(repo_key, {})
         
         # Update branch-specific state
-        current_state['branches'][branch_name] = {
+        current_state.setdefault('branches', {})[branch_name] = {
             'last_commit': branch_commits[-1]['sha'] if branch_commits else None,
             'commits_ahead': commits_ahead,
-            'last_check': datetime.now().isoformat()
+            'last_check': now
         }
         
-        current_state['last_branch_check'] = datetime.now().isoformat()
-        state[repo_key] = current_state
+        current_state['last_branch_check'] = now
+    
+    @staticmethod
+    def update_branch_states_bulk(state, repo_key, branch_analyses, now=None):
+        """
+        Update state for several branches at once (one timestamp, one pass over the repo entry)
+        
+        Args:
+            state: The state dictionary to update
+            repo_key: Repository key (owner/repo format)
+            branch_analyses: Branch data dicts with 'branch_name', 'commits' and 'commits_ahead'
+            now: Epoch-seconds timestamp shared with the caller's other updates (defaults to the current time)
+        """
+        if not branch_analyses:
+            return
+        
+        now = now or int(time.time())
+        current_state = state.setdefault(repo_key, {})
+        branches = current_state.setdefault('branches', {})
+        for branch_data in branch_analyses:
+            commits = branch_data['commits']
+            branch_state = {
+                'last_commit': commits[-1]['sha'] if commits else None,
+                'commits_ahead': branch_data['commits_ahead'],
+                'last_check': now
+            }
+            # Commit date of the newest processed commit - lets orphan branches ask for ?since=
+            last_commit_date = commits[-1].get('commit', {}).get('committer', {}).get('date') if commits else None
+            if last_commit_date:
+                branch_state['last_commit_date'] = last_commit_date
+            branches[branch_data['branch_name']] = branch_state
+        current_state['last_branch_check'] = now
+    
+    @staticmethod
+    def apply_branch_delta(state, repo_key, branch_deltas, now=None):
+        """
+        Record new head SHAs for branches in place, touching only the given entries
+        
+        Args:
+            state: The state dictionary to update
+            repo_key: Repository key (owner/repo format)
+            branch_deltas: Dictionary of branch_name -> head SHA for branches whose head moved
+            now: Epoch-seconds timestamp shared with the caller's other updates (defaults to the current time)
+        """
+        if not branch_deltas:
+            return
+        
+        now = now or int(time.time())
+        branches = state.setdefault(repo_key, {}).setdefault('branches', {})
+        for branch_name, sha in branch_deltas.items():
+            branches.setdefault(branch_name, {}).update(last_commit=sha, last_check=now)
     
     @staticmethod
     def update_fork_state(state, repo_key, fork_info):
@@ -76,50 +154,53 @@ class StateManager:
             repo_key: Repository key (owner/repo format)
             fork_info: Fork information dictionary containing:
                 - fork_name: Full fork name (owner/repo)
+                - default_branch: The fork's default branch name
                 - branches: List of branch analysis results
                 - all_processed_branches: All branches processed (for state saving)
         """
-        updated_state = state.get(repo_key, {})
+        now = int(time.time())  # One timestamp for the fork and all of its branches
+        updated_state = state.setdefault(repo_key, {})
         
-        # Initialize fork tracking section
-        if 'processed_forks' not in updated_state:
-            updated_state['processed_forks'] = {}
+        # Fork tracking section, created on first use
+        processed_forks = updated_state.setdefault('processed_forks', {})
         
         # Update fork-specific state
         fork_key = fork_info['fork_name']
         
-        # Multi-branch state format - save ALL processed branches
-        branch_states = {}
-        branches_to_save = fork_info.get('all_processed_branches', fork_info['branches'])
+        # Re-analysed forks refill their previous entries in place (same keys, new values) instead of
+        # building a fresh fork dict, branch map and per-branch dicts on every poll
+        fork_state = processed_forks.get(fork_key)
+        if fork_state is None:
+            fork_state = processed_forks[fork_key] = {}
+        branch_states = fork_state.get('branches')
+        if branch_states is None:
+            branch_states = {}
         
-        for branch_analysis in branches_to_save:
-            branch_name = branch_analysis['branch_name']
-            branch_commits = branch_analysis['commits']
-            
-            # For state saving, use original_commits to get the latest SHA even when filtered to 0
-            original_commits = branch_analysis.get('original_commits', branch_commits)
-            latest_commit_sha = None
-            if original_commits:
-                latest_commit_sha = original_commits[-1]['sha']
-            elif branch_commits:
-                latest_commit_sha = branch_commits[-1]['sha']
-            
-            branch_states[branch_name] = {
-                'last_ahead_commit': latest_commit_sha,
-                'commits_ahead': branch_analysis['commits_ahead'],
-                'last_check': datetime.now().isoformat()
-            }
+        # Multi-branch state format - save ALL processed branches (and only those)
+        branches_to_save = fork_info.get('all_processed_branches', fork_info['branches'])
+        entries = [
+            (branch_analysis, branch_states.pop(branch_analysis['branch_name'], None))
+            for branch_analysis in branches_to_save
+        ]
+        branch_states.clear()
+        for branch_analysis, entry in entries:
+            if entry is None:
+                entry = {}
+            entry['last_ahead_commit'] = _latest_ahead_sha(branch_analysis)
+            entry['commits_ahead'] = branch_analysis['commits_ahead']
+            entry['last_check'] = now
+            branch_states[branch_analysis['branch_name']] = entry
         
-        updated_state['processed_forks'][fork_key] = {
-            'branches': branch_states,
-            'default_branch': next((b['branch_name'] for b in fork_info['branches'] if b.get('is_default')), 'main'),
-            'total_commits_ahead': fork_info['commits_ahead'],
-            'last_check': datetime.now().isoformat()
-        }
+        fork_state.clear()
+        fork_state['branches'] = branch_states
+        fork_state['default_branch'] = fork_info.get('default_branch') or 'main'
+        fork_state['total_commits_ahead'] = fork_info['commits_ahead']
+        fork_state['last_check'] = now
+        if fork_info.get('pushed_at'):
+            fork_state['last_pushed_at'] = fork_info['pushed_at']
         
         # Update general fork check timestamp
-        updated_state['last_fork_check'] = datetime.now().isoformat()
-        state[repo_key] = updated_state
+        updated_state['last_fork_check'] = now
     
     @staticmethod
     def should_process_fork_by_state(state, repo_key, fork_name, branch_analyses, save_state_enabled=True):
@@ -139,27 +220,19 @@ class StateManager:
         if not save_state_enabled:
             return True
             
-        repo_state = state.get(repo_key, {})
-        processed_forks = repo_state.get('processed_forks', {})
-        
-        if fork_name not in processed_forks:
+        fork_state = state.get(repo_key, _EMPTY).get('processed_forks', _EMPTY).get(fork_name)
+        if fork_state is None:
             return True
         
-        # Check if any branch has new commits
-        fork_state = processed_forks[fork_name]
-        saved_branches = fork_state.get('branches', {})
-        
+        # Check if any branch has new commits - one lookup per branch, no placeholder dicts
+        saved_branches = fork_state.get('branches', _EMPTY)
         for branch_analysis in branch_analyses:
-            branch_name = branch_analysis['branch_name']
             current_commits = branch_analysis['commits']
-            
             if not current_commits:
                 continue
-                
-            current_latest_commit = current_commits[-1]['sha']
-            saved_latest_commit = saved_branches.get(branch_name, {}).get('last_ahead_commit')
             
-            if current_latest_commit != saved_latest_commit:
+            saved_branch = saved_branches.get(branch_analysis['branch_name'])
+            if saved_branch is None or saved_branch.get('last_ahead_commit') != current_commits[-1]['sha']:
                 return True
         
         return False
@@ -185,8 +258,7 @@ class StateManager:
         if not branch_commits:
             return False
             
-        repo_state = state.get(repo_key, {})
-        branch_states = repo_state.get('branches', {})
+        branch_states = state.get(repo_key, _EMPTY).get('branches', _EMPTY)
         
         if branch_name not in branch_states:
             return True  # New branch
@@ -210,29 +282,52 @@ class StateManager:
         Returns:
             tuple: (needs_processing: bool, new_branches: list, changed_branches: list)
         """
-        repo_state = state.get(repo_key, {})
+        repo_state = state.get(repo_key, _EMPTY)
         
         # Check main branch first
         saved_main_sha = repo_state.get('last_commit')
         main_changed = saved_main_sha != current_main_sha
         
         # Check branches
-        saved_branches = repo_state.get('branches', {})
+        saved_branches = repo_state.get('branches', _EMPTY)
         new_branches = []
         changed_branches = []
         
-        # Find new and changed branches
+        # Find new and changed branches - one saved-branch lookup per branch. There is no cheaper
+        # "nothing changed" pre-check: confirming that still takes a comparison per branch.
+        saved_branch_get = saved_branches.get
         for branch_name, current_sha in current_branch_shas.items():
-            if branch_name not in saved_branches:
+            saved_branch = saved_branch_get(branch_name)
+            if saved_branch is None:
                 new_branches.append(branch_name)
-            else:
-                saved_sha = saved_branches[branch_name].get('last_commit')
-                if saved_sha != current_sha:
-                    changed_branches.append(branch_name)
+            elif saved_branch.get('last_commit') != current_sha:
+                changed_branches.append(branch_name)
         
         needs_processing = main_changed or new_branches or changed_branches
         return needs_processing, new_branches, changed_branches
 
+    @staticmethod
+    def unchanged_since_last_push(state, repo_key, pushed_at):
+        """
+        Check if nothing has been pushed since the repository was last fully processed
+        
+        Args:
+            state: The state dictionary to check
+            repo_key: Repository key (owner/repo format)
+            pushed_at: Current pushed_at timestamp from the repository API (ISO 8601, UTC)
+            
+        Returns:
+            bool: True if the saved push timestamp is at least as new as pushed_at
+        """
+        saved_pushed_at = state.get(repo_key, _EMPTY).get('last_pushed_at')
+        return bool(pushed_at and saved_pushed_at and pushed_at <= saved_pushed_at)
+
+    @staticmethod
+    def update_pushed_at(state, repo_key, pushed_at):
+        """Record the pushed_at timestamp a repository was fully processed at"""
+        if pushed_at:
+            state.setdefault(repo_key, {})['last_pushed_at'] = pushed_at
+
     @staticmethod
     def main_branch_unchanged(state, repo_key, current_main_sha):
         """
@@ -246,33 +341,25 @@ class StateManager:
         Returns:
             bool: True if main branch hasn't changed
         """
-        repo_state = state.get(repo_key, {})
-        saved_main_sha = repo_state.get('last_commit')
-        return saved_main_sha == current_main_sha
+        return state.get(repo_key, _EMPTY).get('last_commit') == current_main_sha
 
     @staticmethod
     def get_repository_state(state, repo_key):
-        """Get repository state with defaults"""
-        return state.get(repo_key, {})
+        """Get repository state with defaults (read-only empty mapping if missing)"""
+        return state.get(repo_key, _EMPTY)
     
     @staticmethod  
     def get_fork_state(state, repo_key, fork_name):
-        """Get fork state with defaults"""
-        repo_state = StateManager.get_repository_state(state, repo_key)
-        processed_forks = repo_state.get('processed_forks', {})
-        return processed_forks.get(fork_name, {})
+        """Get fork state with defaults (read-only empty mapping if missing)"""
+        return state.get(repo_key, _EMPTY).get('processed_forks', _EMPTY).get(fork_name, _EMPTY)
     
     @staticmethod
     def get_branch_state(state, repo_key, branch_name, is_fork=False, fork_name=None):
-        """Get branch state with defaults"""
+        """Get branch state with defaults (read-only empty mapping if missing) - one walk down the state"""
+        owner_state = state.get(repo_key, _EMPTY)
         if is_fork and fork_name:
-            fork_state = StateManager.get_fork_state(state, repo_key, fork_name)
-            branches = fork_state.get('branches', {})
-            return branches.get(branch_name, {})
-        else:
-            repo_state = StateManager.get_repository_state(state, repo_key)
-            branches = repo_state.get('branches', {})
-            return branches.get(branch_name, {})
+            owner_state = owner_state.get('processed_forks', _EMPTY).get(fork_name, _EMPTY)
+        return owner_state.get('branches', _EMPTY).get(branch_name, _EMPTY)
 
     @staticmethod
     def should_process_repository(state, repo_key, repo_type, current_sha=None, current_release=None, save_state_enabled=True):
@@ -289,9 +376,11 @@ class StateManager:
                 return True
         
         # Check release if provided  
+        # last_release is always written as str(id) - only the caller's value may need coercion
         if current_release:
-            saved_release = repo_state.get('last_release')
-            if str(saved_release) != str(current_release):
+            if type(current_release) is not str:
+                current_release = str(current_release)
+            if repo_state.get('last_release') != current_release:
                 return True
                 
         # If no changes found and we have state, skip
@@ -309,7 +398,7 @@ class StateManager:
             
         if current_ahead_sha:
             # Check if any branch has new commits (simplified check)
-            branches = fork_state.get('branches', {})
+            branches = fork_state.get('branches', _EMPTY)
             for branch_name, branch_state in branches.items():
                 saved_sha = branch_state.get('last_ahead_commit')
                 if saved_sha != current_ahead_sha:
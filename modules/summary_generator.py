@@ -1,22 +1,12 @@
+import string
+
 from .ai_provider import create_ai_provider
 from .display import get_terminal_width
+from .debug_logger import DebugLogger
 
 
-class SummaryGenerator:
-    def __init__(self, config_manager, template_name='summary'):
-        self.config_manager = config_manager
-        self.ai_provider = create_ai_provider(config_manager)
-        self.template_name = template_name
-    
-    def generate_summary(self, repo_data):
-        """Generate summary using configured AI provider"""
-        prompt = self._build_prompt(repo_data)
-        result = self.ai_provider.generate_summary(prompt)
-        return result
-
-    def _get_news_template(self):
-        """News/commits summary template"""
-        return """
+# Prompt templates are static - built once at import instead of on every summary
+NEWS_TEMPLATE = """
         
 Summarize recent activity for {repo_name} repository:
 
@@ -41,9 +31,7 @@ Do not add a title, headline - start directly with the bullet points. Do not inc
 
 """
 
-    def _get_fork_template(self):
-        """Fork analysis template"""
-        return """
+FORK_TEMPLATE = """
         
 You are analyzing GitHub repository forks with multi-branch analysis to gather whats new in this fork vs original repository.
 
@@ -70,9 +58,57 @@ Focus on practical value and multi-branch development patterns. Output plain tex
 {parent_readme}
 
 """
+
+
+def _compile_template(template):
+    """Split a template into (literal, field_name) chunks once, so rendering never re-parses it
+    
+    The templates only use plain {field} placeholders (no format specs or conversions).
+    """
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+
+def _render_template(chunks, **values):
+    """Fill pre-parsed template chunks - same output as template.format(**values)"""
+    parts = []
+    for literal, field in chunks:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+    return ''.join(parts)
+
+
+NEWS_TEMPLATE_CHUNKS = _compile_template(NEWS_TEMPLATE)
+FORK_TEMPLATE_CHUNKS = _compile_template(FORK_TEMPLATE)
+
+
+class SummaryGenerator:
+    def __init__(self, config_manager, template_name='summary'):
+        self.config_manager = config_manager
+        self.ai_provider = create_ai_provider(config_manager)
+        self.template_name = template_name
+        self.debug_logger = DebugLogger(config_manager)
+    
+    def generate_summary(self, repo_data):
+        """Generate summary using configured AI provider"""
+        prompt = self._build_prompt(repo_data)
+        result = self.ai_provider.generate_summary(prompt)
+        return result
+
+    def generate_summaries_batch(self, items, pool):
+        """Generate summaries for several repo/branch items concurrently; results follow item order
+        
+        The providers are one-request-per-prompt CLIs, so batching means overlapping the calls
+        rather than merging the prompts. Each call blocks in subprocess.run / an HTTP request with
+        the GIL released, so threads scale here; a process pool would only add pickling overhead.
+        
+        pool: the caller's shared executor for AI calls - its size is the cap on concurrent calls,
+        however many repositories batch at once (single items run on it too)
+        """
+        return list(pool.map(self.generate_summary, items))
     
     def _build_prompt(self, repo_data):
-        """Build prompt using inline templates"""
+        """Build prompt from the module-level templates"""
         debug_mode = self.config_manager.get_boolean_setting('debug')
         
         # Check if this is a fork analysis or regular summary
@@ -83,8 +119,8 @@ Focus on practical value and multi-branch development patterns. Output plain tex
             # Build branches section for multi-branch analysis
             branches_section = self._build_branches_section(repo_data.get('branches', []))
             
-            template = self._get_fork_template()
-            prompt = template.format(
+            prompt = _render_template(
+                FORK_TEMPLATE_CHUNKS,
                 repo_name=repo_data['name'],
                 fork_name=repo_data['fork_name'],
                 fork_url=repo_data['fork_url'],
@@ -115,8 +151,8 @@ Focus on practical value and multi-branch development patterns. Output plain tex
             else:
                 bullet_count = self.config_manager.get_setting('main_summary_bullets', '5-10')
             
-            template = self._get_news_template()
-            prompt = template.format(
+            prompt = _render_template(
+                NEWS_TEMPLATE_CHUNKS,
                 repo_name=repo_data['name'],
                 commits_section=commits_section,
                 releases_section=releases_section,
@@ -126,8 +162,7 @@ Focus on practical value and multi-branch development patterns. Output plain tex
         
         # Show summary of prompt content in debug mode (headlines only)
         if debug_mode:
-            from .debug_logger import DebugLogger
-            debug_logger = DebugLogger(self.config_manager)
+            debug_logger = self.debug_logger
             debug_logger.debug("Prompt summary:")
             if repo_data.get('commits'):
                 max_commits = self.config_manager.get_int_setting('max_commits', 10)
@@ -145,10 +180,8 @@ Focus on practical value and multi-branch development patterns. Output plain tex
             debug_logger.debug("="*min(50, get_terminal_width()))
         
         # Save full prompt to debug file (works independently of debug mode)
-        from .debug_logger import DebugLogger
-        debug_logger = DebugLogger(self.config_manager)
         prompt_type = "fork_summary" if 'fork_name' in repo_data else "summary"
-        debug_logger.debug_full_prompt(prompt, repo_data['name'], prompt_type)
+        self.debug_logger.debug_full_prompt(prompt, repo_data['name'], prompt_type)
         
         return prompt
     
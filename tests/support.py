@@ -0,0 +1,84 @@
+"""Shared fixtures: a temporary state directory and processors built without config.txt or the network"""
+
+import concurrent.futures
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from modules.config_manager import ConfigManager
+from modules.parallel_base_processor import STATE_LOCK_STRIPES
+
+
+class TempStateMixin:
+    """Gives each test a ConfigManager whose config and state files live in a fresh temporary directory"""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp(prefix='gh-utils-test-')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.config_manager = ConfigManager(
+            os.path.join(self.tmpdir, 'config.txt'), os.path.join(self.tmpdir, 'state.json')
+        )
+
+    def journal_path(self, state_type='news'):
+        return self.config_manager.get_state_journal_filename(state_type)
+
+
+def make_processor(processor_class, config_manager, state=None, **settings):
+    """Processor instance wired to mocks, bypassing __init__ (which reads config.txt and resolves a token)
+
+    The fetcher, generator and display methods are mocks; the state locks, dirty set, flusher and
+    pools are the real thing. Call shutdown_processor() when done.
+    """
+    processor = processor_class.__new__(processor_class)
+    cfg = dict(
+        debug=False, save_state=True, max_commits=10, max_releases=10, max_branches=5, min_commits=1,
+        show_costs=False, max_workers=2, repo_timeout=60, max_api_inflight=4, max_ai_workers=2,
+    )
+    cfg.update(settings)
+    processor._cfg = SimpleNamespace(**cfg)
+    processor.config_manager = config_manager
+    processor.repos = []
+    processor.state = state if state is not None else {}
+    processor._state_locks = tuple(threading.Lock() for _ in range(STATE_LOCK_STRIPES))
+    processor._state_write_lock = threading.Lock()
+    processor._dirty_repos = set()
+    processor._abandoned_repos = set()
+    processor._flush_stopped = threading.Event()
+    processor._flush_timer = None
+    processor._log_queue = queue.SimpleQueue()
+    processor.fetcher = mock.Mock()
+    processor.generator = mock.Mock()
+    processor.generator.generate_summaries_batch.side_effect = lambda items, pool: [
+        {'summary': f"- summary of {item['name']}", 'cost_info': None} for item in items
+    ]
+    processor.display = mock.Mock()
+    processor._display_methods = mock.MagicMock()
+    processor.debug_logger = None
+    processor._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    processor._ai_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    if hasattr(processor_class, '_repo_heads'):
+        processor._repo_heads = {}
+    return processor
+
+
+def shutdown_processor(processor):
+    processor._io_pool.shutdown()
+    processor._ai_pool.shutdown()
+
+
+def commit(sha, date, parent=None):
+    """REST commits-API shaped commit"""
+    return {
+        'sha': sha,
+        'commit': {
+            'message': f'commit {sha}',
+            'author': {'name': 'A', 'email': 'a@example.com', 'date': date},
+            'committer': {'name': 'A', 'email': 'a@example.com', 'date': date},
+        },
+        'parents': [{'sha': parent}] if parent else [],
+    }
@@ -0,0 +1,60 @@
+"""State file and journal persistence"""
+
+import json
+import os
+import unittest
+
+from tests.support import TempStateMixin
+
+
+class StateJournalTest(TempStateMixin, unittest.TestCase):
+
+    def test_append_writes_one_line_per_repository(self):
+        self.config_manager.append_state_journal({'o/a': {'last_commit': 'a1'}, 'o/b': {'last_commit': 'b1'}})
+
+        with open(self.journal_path()) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, [
+            {'repo_key': 'o/a', 'state': {'last_commit': 'a1'}},
+            {'repo_key': 'o/b', 'state': {'last_commit': 'b1'}},
+        ])
+        self.assertTrue(self.config_manager.has_state_journal())
+
+    def test_load_replays_journal_over_state_file_in_order(self):
+        self.config_manager.save_state({'o/a': {'last_commit': 'a0'}, 'o/b': {'last_commit': 'b0'}})
+        self.config_manager.append_state_journal({'o/a': {'last_commit': 'a1'}})
+        self.config_manager.append_state_journal({'o/a': {'last_commit': 'a2'}})
+
+        state = self.config_manager.load_state()
+
+        self.assertEqual(state, {'o/a': {'last_commit': 'a2'}, 'o/b': {'last_commit': 'b0'}})
+
+    def test_save_state_compacts_journal(self):
+        self.config_manager.append_state_journal({'o/a': {'last_commit': 'a1'}})
+
+        self.config_manager.save_state(self.config_manager.load_state())
+
+        self.assertFalse(self.config_manager.has_state_journal())
+        with open(self.config_manager.get_state_filename('news')) as f:
+            self.assertEqual(json.load(f), {'o/a': {'last_commit': 'a1'}})
+        self.assertFalse(os.path.exists(self.config_manager.get_state_filename('news') + '.tmp'))
+
+    def test_torn_final_line_is_ignored(self):
+        self.config_manager.save_state({'o/a': {'last_commit': 'a0'}})
+        self.config_manager.append_state_journal({'o/a': {'last_commit': 'a1'}})
+        with open(self.journal_path(), 'a') as f:
+            f.write('{"repo_key": "o/a", "state": {"last_comm')  # Interrupted mid-write
+
+        state = self.config_manager.load_state()
+
+        self.assertEqual(state, {'o/a': {'last_commit': 'a1'}})
+
+    def test_journals_are_kept_per_state_type(self):
+        self.config_manager.append_state_journal({'o/a': {'last_fork_check': 1}}, 'forks')
+
+        self.assertEqual(self.config_manager.load_state('news'), {})
+        self.assertEqual(self.config_manager.load_state('forks'), {'o/a': {'last_fork_check': 1}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""GraphQL error handling and the batched repository prefetch"""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from modules.github_fetcher import GitHubFetcher
+
+
+def graphql_response(payload):
+    return 200, json.dumps(payload).encode(), {}
+
+
+class GraphQLTest(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.dict(os.environ, {'GH_TOKEN': 'test-token'}):
+            self.fetcher = GitHubFetcher()
+        self.fetcher._request = mock.Mock()
+
+    def test_errors_raise_by_default(self):
+        self.fetcher._request.return_value = graphql_response({
+            'data': {'r0': None}, 'errors': [{'message': 'Could not resolve to a Repository'}],
+        })
+
+        with self.assertRaisesRegex(RuntimeError, 'Could not resolve'):
+            self.fetcher.graphql('query { x }')
+
+    def test_partial_data_is_returned_when_allowed(self):
+        self.fetcher._request.return_value = graphql_response({
+            'data': {'r0': None, 'r1': {'pushedAt': '2024-01-01T00:00:00Z'}},
+            'errors': [{'type': 'NOT_FOUND', 'path': ['r0'], 'message': 'Could not resolve to a Repository'}],
+        })
+
+        data = self.fetcher.graphql('query { x }', allow_partial=True)
+
+        self.assertEqual(data, {'r0': None, 'r1': {'pushedAt': '2024-01-01T00:00:00Z'}})
+
+    def test_errors_without_data_raise_even_when_partial_allowed(self):
+        self.fetcher._request.return_value = graphql_response({'data': None, 'errors': [{'message': 'Bad query'}]})
+
+        with self.assertRaisesRegex(RuntimeError, 'Bad query'):
+            self.fetcher.graphql('query { x }', allow_partial=True)
+
+    def test_heads_batch_drops_only_errored_repositories(self):
+        self.fetcher._request.return_value = graphql_response({
+            'data': {
+                'r0': {'pushedAt': '2024-01-01T00:00:00Z', 'defaultBranchRef': {'name': 'main', 'target': {'oid': 'a1'}}},
+                'r1': None,
+                'r2': {'pushedAt': '2024-01-02T00:00:00Z', 'defaultBranchRef': None},
+            },
+            'errors': [{'type': 'NOT_FOUND', 'path': ['r1'], 'message': 'Could not resolve to a Repository'}],
+        })
+
+        heads = self.fetcher.get_repository_heads_batch([('Octo', 'App'), ('gone', 'repo'), ('octo', 'empty')])
+
+        self.assertEqual(heads, {
+            'octo/app': {'pushed_at': '2024-01-01T00:00:00Z', 'default_branch': 'main', 'head_sha': 'a1'},
+            'octo/empty': {'pushed_at': '2024-01-02T00:00:00Z', 'default_branch': None, 'head_sha': None},
+        })
+
+    def test_heads_batch_skips_failed_query(self):
+        self.fetcher._request.return_value = graphql_response({'errors': [{'message': 'rate limited'}]})
+
+        self.assertEqual(self.fetcher.get_repository_heads_batch([('octo', 'app')]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
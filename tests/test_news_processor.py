@@ -0,0 +1,138 @@
+"""News processing decisions: the pushed_at veto, incomplete passes and the ?since= commit page"""
+
+import unittest
+
+from modules.commit_utils import reaches_commit
+from modules.news_processor import NewsProcessor
+from tests.support import TempStateMixin, commit, make_processor, shutdown_processor
+
+REPO = {'name': 'app', 'url': 'https://github.com/o/app', '_owner': 'o', '_repo_name': 'app', '_repo_key': 'o/app'}
+PUSHED_AT = '2024-03-01T00:00:00Z'
+
+
+class ProcessRepositoryTest(TempStateMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.processor = make_processor(NewsProcessor, self.config_manager)
+        self.addCleanup(shutdown_processor, self.processor)
+        fetcher = self.processor.fetcher
+        fetcher.get_repo_pushed_at.return_value = PUSHED_AT
+        fetcher.get_current_main_sha.return_value = 'c2'
+        fetcher.get_default_branch.return_value = 'main'
+        fetcher.get_fork_info.return_value = (False, None, None)
+        fetcher.get_commits.return_value = [commit('c2', '2024-02-02T00:00:00Z', 'c1'), commit('c1', '2024-02-01T00:00:00Z')]
+        fetcher.get_releases.return_value = []
+        fetcher.get_repository_branches.return_value = []
+        fetcher.get_branch_shas_only.return_value = []
+        fetcher.get_latest_version.return_value = 'v1.0'
+
+    def test_pushed_at_veto_skips_all_other_reads(self):
+        self.processor.state['o/app'] = {'last_commit': 'c0', 'last_pushed_at': PUSHED_AT}
+
+        self.processor._process_repository(REPO)
+
+        self.processor.fetcher.get_current_main_sha.assert_not_called()
+        self.processor.fetcher.get_commits.assert_not_called()
+        self.assertEqual(self.processor._dirty_repos, set())
+
+    def test_prefetched_pushed_at_is_used_for_the_veto(self):
+        self.processor.state['o/app'] = {'last_pushed_at': PUSHED_AT}
+        self.processor._repo_heads = {'o/app': {'pushed_at': PUSHED_AT, 'head_sha': 'c2', 'default_branch': 'main'}}
+
+        self.processor._process_repository(REPO)
+
+        self.processor.fetcher.get_repo_pushed_at.assert_not_called()
+        self.processor.fetcher.get_commits.assert_not_called()
+
+    def test_complete_pass_records_pushed_at(self):
+        self.processor._process_repository(REPO)
+
+        repo_state = self.processor.state['o/app']
+        self.assertEqual(repo_state['last_pushed_at'], PUSHED_AT)
+        self.assertEqual(repo_state['last_commit'], 'c2')
+        self.assertEqual(self.processor._dirty_repos, {'o/app'})
+
+    def test_incomplete_pass_leaves_pushed_at_unrecorded(self):
+        self.processor.fetcher.get_repository_branches.side_effect = RuntimeError('branch listing failed')
+
+        self.processor._process_repository(REPO)
+
+        # The main branch is still summarized, but the next run must not be vetoed
+        repo_state = self.processor.state['o/app']
+        self.assertEqual(repo_state['last_commit'], 'c2')
+        self.assertNotIn('last_pushed_at', repo_state)
+        self.processor._process_repository(REPO)
+        self.assertEqual(self.processor.fetcher.get_current_main_sha.call_count, 2)
+
+
+class CommitsSinceTest(TempStateMixin, unittest.TestCase):
+    """?since= filters on committer date, so a filtered page is only trusted if it links the head to the last commit"""
+
+    def setUp(self):
+        super().setUp()
+        self.processor = make_processor(NewsProcessor, self.config_manager)
+        self.addCleanup(shutdown_processor, self.processor)
+
+    def serve(self, history):
+        def get_commits(owner, repo, since=None, limit=10, branch=None, since_timestamp=None):
+            return [c for c in history if not since_timestamp or c['commit']['committer']['date'] >= since_timestamp][:limit]
+        self.processor.fetcher.get_commits.side_effect = get_commits
+
+    def test_linked_filtered_page_is_used(self):
+        self.serve([commit('c3', '2024-01-03T00:00:00Z', 'c2'), commit('c2', '2024-01-02T00:00:00Z', 'c1'),
+                    commit('c1', '2024-01-01T00:00:00Z')])
+
+        commits = self.processor._get_commits_since('o', 'app', 'c2', '2024-01-02T00:00:00Z', 10, 'c3')
+
+        self.assertEqual([c['sha'] for c in commits], ['c3', 'c2'])
+        self.assertEqual(self.processor.fetcher.get_commits.call_count, 1)
+
+    def test_backdated_head_triggers_unfiltered_fetch(self):
+        self.serve([commit('b0', '2023-12-31T00:00:00Z', 'c2'), commit('c2', '2024-01-02T00:00:00Z', 'c1'),
+                    commit('c1', '2024-01-01T00:00:00Z')])
+
+        commits = self.processor._get_commits_since('o', 'app', 'c2', '2024-01-02T00:00:00Z', 10, 'b0')
+
+        self.assertEqual([c['sha'] for c in commits], ['b0', 'c2', 'c1'])
+        self.assertEqual(self.processor.fetcher.get_commits.call_count, 2)
+
+    def test_backdated_commit_behind_new_head_triggers_unfiltered_fetch(self):
+        self.serve([commit('c3', '2024-01-03T00:00:00Z', 'b0'), commit('b0', '2023-12-31T00:00:00Z', 'c2'),
+                    commit('c2', '2024-01-02T00:00:00Z', 'c1')])
+
+        commits = self.processor._get_commits_since('o', 'app', 'c2', '2024-01-02T00:00:00Z', 10, 'c3')
+
+        self.assertEqual([c['sha'] for c in commits], ['c3', 'b0', 'c2'])
+
+    def test_without_saved_commit_date_fetches_unfiltered(self):
+        self.serve([commit('c1', '2024-01-01T00:00:00Z')])
+
+        self.processor._get_commits_since('o', 'app', 'c1', None, 10, 'c1')
+
+        self.processor.fetcher.get_commits.assert_called_once_with('o', 'app', limit=10, branch=None)
+
+
+class ReachesCommitTest(unittest.TestCase):
+
+    def test_follows_first_parents(self):
+        commits = [commit('m', '2024-01-03T00:00:00Z', 'c2'), commit('c2', '2024-01-02T00:00:00Z', 'c1')]
+
+        self.assertTrue(reaches_commit(commits, 'm', 'c1'))
+        self.assertTrue(reaches_commit(commits, None, 'c2'))
+        self.assertFalse(reaches_commit(commits, 'm', 'c0'))
+        self.assertFalse(reaches_commit(commits, 'x', 'c1'))
+
+    def test_matches_abbreviated_target(self):
+        commits = [commit('abcdef1234', '2024-01-02T00:00:00Z', 'fedcba9876')]
+
+        self.assertTrue(reaches_commit(commits, 'abcdef1234', 'fedcba'))
+
+    def test_parent_loop_terminates(self):
+        commits = [commit('a', '2024-01-02T00:00:00Z', 'b'), commit('b', '2024-01-01T00:00:00Z', 'a')]
+
+        self.assertFalse(reaches_commit(commits, 'a', 'c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
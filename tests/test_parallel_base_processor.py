@@ -0,0 +1,107 @@
+"""Dirty-state tracking, journal flushes and the final save"""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from modules.news_processor import NewsProcessor
+from modules.state_manager import StateManager
+from tests.support import TempStateMixin, make_processor, shutdown_processor
+
+
+class FlushDirtyStateTest(TempStateMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.processor = make_processor(NewsProcessor, self.config_manager, state={
+            'o/a': {'last_commit': 'a1'}, 'o/b': {'last_commit': 'b1'},
+        })
+        self.addCleanup(shutdown_processor, self.processor)
+
+    def journal_entries(self):
+        with open(self.journal_path()) as f:
+            return [json.loads(line) for line in f]
+
+    def test_periodic_flush_journals_only_dirty_repositories(self):
+        self.processor._update_state('o/a', StateManager.update_pushed_at, '2024-01-01T00:00:00Z')
+
+        self.processor._flush_dirty_state()
+
+        self.assertEqual(self.journal_entries(), [
+            {'repo_key': 'o/a', 'state': {'last_commit': 'a1', 'last_pushed_at': '2024-01-01T00:00:00Z'}},
+        ])
+        self.assertEqual(self.processor._dirty_repos, set())
+        self.assertFalse(os.path.exists(self.config_manager.get_state_filename('news')))
+
+    def test_flush_with_nothing_dirty_writes_nothing(self):
+        self.processor._flush_dirty_state()
+
+        self.assertFalse(self.config_manager.has_state_journal())
+
+    def test_failed_append_keeps_repositories_dirty(self):
+        self.processor._dirty_repos.add('o/a')
+
+        with mock.patch.object(self.config_manager, 'append_state_journal', side_effect=OSError('disk full')):
+            self.processor._flush_dirty_state()
+
+        self.assertEqual(self.processor._dirty_repos, {'o/a'})
+        method, args, _ = self.processor._log_queue.get_nowait()  # Warning goes through the printer thread
+        self.assertIn('disk full', args[0])
+
+        self.processor._flush_dirty_state()
+        self.assertEqual([entry['repo_key'] for entry in self.journal_entries()], ['o/a'])
+
+    def test_flush_after_stop_leaves_entries_to_the_final_save(self):
+        self.processor._dirty_repos.add('o/a')
+        self.processor._flush_stopped.set()
+
+        self.processor._flush_dirty_state()
+
+        self.assertFalse(self.config_manager.has_state_journal())
+        self.assertEqual(self.processor._dirty_repos, {'o/a'})
+
+    def test_final_flush_folds_journal_into_state_file(self):
+        self.processor._dirty_repos.add('o/a')
+        self.processor._flush_dirty_state()
+        self.processor.state['o/b']['last_commit'] = 'b2'
+        self.processor._dirty_repos.add('o/b')
+
+        self.processor._flush_dirty_state(final=True)
+
+        self.assertFalse(self.config_manager.has_state_journal())
+        self.assertEqual(self.config_manager.load_state(), {'o/a': {'last_commit': 'a1'}, 'o/b': {'last_commit': 'b2'}})
+
+    def test_final_flush_skips_write_when_nothing_changed(self):
+        self.processor._flush_dirty_state(final=True)
+
+        self.assertFalse(os.path.exists(self.config_manager.get_state_filename('news')))
+
+
+class UpdateStateTest(TempStateMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.processor = make_processor(NewsProcessor, self.config_manager)
+        self.addCleanup(shutdown_processor, self.processor)
+
+    def test_update_applies_and_marks_dirty(self):
+        self.processor._update_state('o/a', StateManager.apply_branch_delta, {'dev': 'd1'}, now=5)
+
+        self.assertEqual(self.processor.state, {'o/a': {'branches': {'dev': {'last_commit': 'd1', 'last_check': 5}}}})
+        self.assertEqual(self.processor._dirty_repos, {'o/a'})
+
+    def test_abandoned_repository_updates_are_dropped(self):
+        self.processor._update_state('o/a', StateManager.update_pushed_at, '2024-01-01T00:00:00Z')
+        self.processor._dirty_repos.clear()
+        self.processor._abandoned_repos.add('o/a')
+
+        self.processor._update_state('o/a', StateManager.update_pushed_at, '2024-02-01T00:00:00Z')
+        self.processor._update_state('o/b', StateManager.update_pushed_at, '2024-02-01T00:00:00Z')
+
+        self.assertEqual(self.processor.state['o/a'], {'last_pushed_at': '2024-01-01T00:00:00Z'})
+        self.assertEqual(self.processor._dirty_repos, {'o/b'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""StateManager update and decision helpers"""
+
+import unittest
+from datetime import datetime
+
+from modules.state_manager import StateManager
+
+
+class ApplyBranchDeltaTest(unittest.TestCase):
+
+    def test_updates_only_given_branches_in_place(self):
+        feature = {'last_commit': 'f0', 'commits_ahead': 3, 'last_check': 1, 'last_commit_date': '2024-01-01T00:00:00Z'}
+        state = {'o/r': {'last_commit': 'm0', 'branches': {'feature': feature, 'other': {'last_commit': 'x0'}}}}
+
+        StateManager.apply_branch_delta(state, 'o/r', {'feature': 'f1'}, now=100)
+
+        self.assertIs(state['o/r']['branches']['feature'], feature)
+        self.assertEqual(feature, {'last_commit': 'f1', 'commits_ahead': 3, 'last_check': 100, 'last_commit_date': '2024-01-01T00:00:00Z'})
+        self.assertEqual(state['o/r']['branches']['other'], {'last_commit': 'x0'})
+        self.assertEqual(state['o/r']['last_commit'], 'm0')
+
+    def test_creates_missing_entries(self):
+        state = {}
+
+        StateManager.apply_branch_delta(state, 'o/r', {'new': 'n1'}, now=100)
+
+        self.assertEqual(state, {'o/r': {'branches': {'new': {'last_commit': 'n1', 'last_check': 100}}}})
+
+    def test_empty_delta_leaves_state_untouched(self):
+        state = {}
+
+        StateManager.apply_branch_delta(state, 'o/r', {})
+
+        self.assertEqual(state, {})
+
+
+class PushedAtTest(unittest.TestCase):
+
+    def test_unchanged_only_when_saved_timestamp_is_at_least_as_new(self):
+        state = {'o/r': {'last_pushed_at': '2024-01-02T00:00:00Z'}}
+
+        self.assertTrue(StateManager.unchanged_since_last_push(state, 'o/r', '2024-01-02T00:00:00Z'))
+        self.assertTrue(StateManager.unchanged_since_last_push(state, 'o/r', '2024-01-01T00:00:00Z'))
+        self.assertFalse(StateManager.unchanged_since_last_push(state, 'o/r', '2024-01-03T00:00:00Z'))
+
+    def test_missing_timestamps_never_veto(self):
+        self.assertFalse(StateManager.unchanged_since_last_push({}, 'o/r', '2024-01-02T00:00:00Z'))
+        self.assertFalse(StateManager.unchanged_since_last_push({'o/r': {'last_pushed_at': '2024-01-02T00:00:00Z'}}, 'o/r', None))
+
+    def test_update_ignores_missing_timestamp(self):
+        state = {}
+
+        StateManager.update_pushed_at(state, 'o/r', None)
+
+        self.assertEqual(state, {})
+
+
+class CheckTimestampTest(unittest.TestCase):
+
+    def test_epoch_seconds_pass_through(self):
+        self.assertEqual(StateManager.check_timestamp(1700000000), 1700000000)
+        self.assertEqual(StateManager.check_timestamp(1700000000.5), 1700000000.5)
+
+    def test_legacy_iso_string_is_read_as_local_time(self):
+        value = '2024-05-01T12:30:00'
+
+        self.assertEqual(StateManager.check_timestamp(value), datetime(2024, 5, 1, 12, 30).timestamp())
+
+
+class UpdateForkStateTest(unittest.TestCase):
+
+    def test_empty_fork_defaults_to_main(self):
+        state = {}
+        fork_info = {'fork_name': 'alice/r', 'default_branch': None, 'branches': [], 'commits_ahead': 0}
+
+        StateManager.update_fork_state(state, 'o/r', fork_info)
+
+        self.assertEqual(state['o/r']['processed_forks']['alice/r']['default_branch'], 'main')
+
+
+if __name__ == '__main__':
+    unittest.main()